@@ -32,6 +32,7 @@ from hammurabi.rules.files import (
     FilesNotExist,
 )
 from hammurabi.rules.json import (
+    JsonBatch,
     JsonKeyExists,
     JsonKeyNotExists,
     JsonKeyRenamed,
@@ -40,7 +41,7 @@ from hammurabi.rules.json import (
 )
 from hammurabi.rules.operations import Copied, Moved, Renamed
 from hammurabi.rules.templates import TemplateRendered
-from hammurabi.rules.text import LineExists, LineNotExists, LineReplaced
+from hammurabi.rules.text import LineBatch, LineExists, LineNotExists, LineReplaced
 from hammurabi.rules.toml import (
     TomlKeyExists,
     TomlKeyNotExists,
@@ -57,6 +58,7 @@ except ImportError:
 
 try:
     from hammurabi.rules.ini import (
+        IniBatch,
         OptionRenamed,
         OptionsExist,
         OptionsNotExist,
@@ -70,6 +72,7 @@ except ImportError:
 
 try:
     from hammurabi.rules.yaml import (
+        YamlBatch,
         YamlKeyExists,
         YamlKeyNotExists,
         YamlKeyRenamed,
@@ -1,3 +1,39 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+import errno
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+from weakref import WeakSet
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+# Request code of the ``ioctl`` call cloning a file on Linux
+FICLONE = 0x40049409
+
+# Errors of ``copy_file_range`` meaning that the kernel cannot copy between
+# the given files, so the copy must be done by other means
+COPY_RANGE_UNSUPPORTED_ERRORS = frozenset(
+    (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ETXTBSY)
+)
+
+# Maximum number of bytes copied by a single ``copy_file_range`` call
+COPY_RANGE_CHUNK_SIZE = 1 << 30
+
+# Size of the buffer used to copy files which cannot be copied by the kernel
+COPY_BUFFER_SIZE = 1 << 20
+
+# Identity and modification state of a file, see ``get_file_signature``
+FileSignature = Tuple[int, int, int, int]
+
+
 def full_strip(value: str) -> str:
     """
     Strip every line.
@@ -12,3 +48,414 @@ def full_strip(value: str) -> str:
             text.append(stripped_line)
 
     return "\n".join(text)
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "w", buffering: int = -1) -> Iterator[IO[Any]]:
+    """
+    Open a temporary file next to the given path for writing. When the
+    writing is finished, the temporary file replaces the original one, so
+    the original file is never left partially written. In case of an error,
+    the temporary file is removed and the original file is untouched. In
+    case the path is a symlink, the target of the link is replaced.
+
+    :param path: Path of the file to write
+    :type path: Path
+
+    :param mode: Mode in which the temporary file is opened
+    :type mode: str
+
+    :param buffering: Buffer size of the temporary file, the default
+        buffer size is used if not set
+    :type buffering: int
+
+    :return: Returns the opened temporary file
+    :rtype: Iterator[IO[Any]]
+    """
+
+    # Replacing the symlink itself would turn it into a regular file and the
+    # target of the link would never be updated
+    path = path.resolve()
+
+    file = tempfile.NamedTemporaryFile(  # pylint: disable=consider-using-with
+        mode,
+        buffering=buffering,
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+        delete=False,
+    )
+
+    temp_path = Path(file.name)
+
+    try:
+        with file:
+            yield file
+
+        # Keep the permissions of the original file, or use the default
+        # permissions of new files since temporary files are private
+        if path.exists():
+            shutil.copymode(path, temp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            temp_path.chmod(0o666 & ~umask)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+
+        raise
+
+
+def _clone_file(source_fd: int, destination_fd: int) -> bool:
+    """
+    Clone the content of the file by the ``FICLONE`` ioctl. On copy on write
+    file systems (like Btrfs or XFS) the destination shares the data blocks
+    of the source, so the copy takes the same time regardless of the size.
+
+    :param source_fd: File descriptor of the source file
+    :type source_fd: int
+
+    :param destination_fd: File descriptor of the destination file
+    :type destination_fd: int
+
+    :return: Returns False if the file cannot be cloned
+    :rtype: bool
+    """
+
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+
+    try:
+        fcntl.ioctl(destination_fd, FICLONE, source_fd)
+    except OSError:
+        # The destination is not modified by a failing clone, so any other
+        # copy method can be used instead
+        return False
+
+    return True
+
+
+def _copy_file_range(source_fd: int, destination_fd: int) -> bool:
+    """
+    Copy the content of the file within the kernel by ``copy_file_range``,
+    which lets the file system copy the data on the server side (NFS) if it
+    is supported.
+
+    :param source_fd: File descriptor of the source file
+    :type source_fd: int
+
+    :param destination_fd: File descriptor of the destination file
+    :type destination_fd: int
+
+    :return: Returns False if the copy is not supported for the files or
+        nothing was copied
+    :rtype: bool
+    """
+
+    copy_file_range = getattr(os, "copy_file_range", None)
+
+    if copy_file_range is None:
+        return False
+
+    copied = 0
+
+    while True:
+        try:
+            sent = copy_file_range(source_fd, destination_fd, COPY_RANGE_CHUNK_SIZE)
+        except OSError as exc:
+            # Fall back to a regular copy only if nothing was copied yet,
+            # otherwise the destination would be partially written
+            if copied == 0 and exc.errno in COPY_RANGE_UNSUPPORTED_ERRORS:
+                return False
+
+            raise
+
+        # Files reporting zero size (like the files of procfs) are not copied
+        # by the kernel at all, so they must be copied by reading them. For
+        # really empty files the fallback copy has nothing to do.
+        if sent == 0:
+            return copied > 0
+
+        copied += sent
+
+
+def _kernel_copy(source: Path, destination: Path) -> bool:
+    """
+    Copy the content of the file within the kernel. The file is cloned if
+    the file system supports it, otherwise ``copy_file_range`` is used.
+
+    :param source: Path of the source file
+    :type source: Path
+
+    :param destination: Path of the destination file
+    :type destination: Path
+
+    :return: Returns False if the kernel cannot copy the file
+    :rtype: bool
+    """
+
+    with source.open("rb") as source_file, destination.open("wb") as dest_file:
+        source_fd = source_file.fileno()
+        destination_fd = dest_file.fileno()
+
+        return _clone_file(source_fd, destination_fd) or _copy_file_range(
+            source_fd, destination_fd
+        )
+
+
+def _buffered_copy(source: Path, destination: Path) -> None:
+    """
+    Copy the content of the file through a single reused buffer. The buffer
+    is large enough to transfer the content of most files in one read and
+    write system call.
+
+    :param source: Path of the source file
+    :type source: Path
+
+    :param destination: Path of the destination file
+    :type destination: Path
+    """
+
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+
+    with source.open("rb", buffering=0) as source_file, destination.open(
+        "wb"
+    ) as dest_file:
+        fadvise = getattr(os, "posix_fadvise", None)
+
+        if fadvise is not None:
+            fadvise(source_file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        while True:
+            read = source_file.readinto(buffer)
+
+            if not read:
+                break
+
+            dest_file.write(view[:read])
+
+
+def copy_file(source: Union[str, Path], destination: Union[str, Path]) -> Path:
+    """
+    Copy the file with its metadata like ``shutil.copy2`` does, but let the
+    kernel clone or copy the content if possible. In case the kernel cannot
+    copy the content between the files, it is copied through a buffer.
+
+    The function can be used as ``copy_function`` of ``shutil.copytree``.
+
+    :param source: Path of the source file
+    :type source: Union[str, Path]
+
+    :param destination: Path of the destination file or directory
+    :type destination: Union[str, Path]
+
+    :return: Returns the path of the copied file
+    :rtype: Path
+    """
+
+    source = Path(source)
+    destination = Path(destination)
+
+    if destination.is_dir():
+        destination = destination / source.name
+
+    if not _kernel_copy(source, destination):
+        _buffered_copy(source, destination)
+
+    shutil.copystat(source, destination)
+    return destination
+
+
+def copy_tree(source: Path, destination: Path) -> Path:
+    """
+    Copy the directory tree like ``shutil.copytree`` does, but copy the
+    files in parallel by a pool of threads. Copying many small files is
+    bound by the latency of the system calls, which can overlap this way.
+
+    :param source: Path of the source directory
+    :type source: Path
+
+    :param destination: Path of the destination directory
+    :type destination: Path
+
+    :return: Returns the path of the copied directory
+    :rtype: Path
+    """
+
+    futures: List[Future] = list()
+
+    with ThreadPoolExecutor() as executor:
+
+        def submit_copy(file_source: str, file_destination: str) -> str:
+            futures.append(executor.submit(copy_file, file_source, file_destination))
+            return file_destination
+
+        # In case the tree cannot be copied, its error is raised once every
+        # submitted copy finished, which is the more relevant error
+        shutil.copytree(source, destination, copy_function=submit_copy)
+
+    # Raise the first error of the copies after every copy finished
+    for future in futures:
+        future.result()
+
+    # The directories were modified by the files copied after the metadata
+    # of the directories was copied, so copy the metadata again
+    for directory, _, _ in os.walk(source):
+        shutil.copystat(directory, destination / os.path.relpath(directory, source))
+
+    return destination
+
+
+def read_file_bytes(path: Path) -> bytes:
+    """
+    Read the whole content of the file with as few system calls as possible,
+    without going through the buffered and decoded file objects.
+
+    :param path: Path of the file
+    :type path: Path
+
+    :return: Returns the content of the file
+    :rtype: bytes
+    """
+
+    descriptor = os.open(path, os.O_RDONLY)
+
+    try:
+        size = os.fstat(descriptor).st_size
+        chunks = [os.read(descriptor, size)]
+
+        # The file may be larger than a single read can return or grow since
+        # its size was checked, so read until the end of the file
+        while chunks[-1]:
+            chunks.append(os.read(descriptor, max(size, 1)))
+
+        return b"".join(chunks)
+    finally:
+        os.close(descriptor)
+
+
+def get_file_signature(path: Path) -> FileSignature:
+    """
+    Get the signature of the file used to detect if it was modified.
+
+    :param path: Path of the file
+    :type path: Path
+
+    :return: Returns the inode, change time, modification time and size of
+        the file
+    :rtype: FileSignature
+    """
+
+    # The modification time can be set back and may be too coarse to tell
+    # apart writes within the same tick, but the change time of the inode
+    # is always updated and atomic replaces create a new inode
+    stat = path.stat()
+    return stat.st_ino, stat.st_ctime_ns, stat.st_mtime_ns, stat.st_size
+
+
+def get_file_digest(path: Path) -> bytes:
+    """
+    Get the digest of the file content used to detect if it was modified,
+    even if the modification did not change the signature of the file.
+
+    :param path: Path of the file
+    :type path: Path
+
+    :return: Returns the digest of the file content
+    :rtype: bytes
+    """
+
+    return hashlib.blake2b(read_file_bytes(path), digest_size=16).digest()
+
+
+class ParsedFileCache:
+    """
+    Keep the parsed content of files written by a rule, so the next rule
+    targeting the same file can continue with the already parsed content
+    instead of reading and parsing the file again. The cached content is
+    used only if the file was not modified since it was stored.
+
+    An entry is removed from the cache when it is taken, therefore the rule
+    taking the content owns it and must put it back after writing the file.
+
+    The file may be rewritten in place at the same size within a single
+    timestamp tick by rules not using the cache or by external tools, so
+    the content of the file is compared too. Reading the file is still much
+    cheaper than parsing it again.
+    """
+
+    def __init__(self) -> None:
+        self.__entries: Dict[Path, Tuple[FileSignature, bytes, Any]] = dict()
+        PARSED_FILE_CACHES.add(self)
+
+    def put(self, path: Path, content: Any) -> None:
+        """
+        Store the parsed content of the file right after it was written.
+
+        :param path: Path of the file
+        :type path: Path
+
+        :param content: The parsed content of the file
+        :type content: Any
+        """
+
+        self.__entries[path] = (
+            get_file_signature(path),
+            get_file_digest(path),
+            content,
+        )
+
+    def take(self, path: Path) -> Optional[Any]:
+        """
+        Remove and return the parsed content of the file if the file was not
+        modified since the content was stored.
+
+        :param path: Path of the file
+        :type path: Path
+
+        :return: Returns the parsed content or None if it cannot be used
+        :rtype: Optional[Any]
+        """
+
+        entry = self.__entries.pop(path, None)
+
+        if entry is None:
+            return None
+
+        signature, digest, content = entry
+
+        try:
+            if signature != get_file_signature(path):
+                return None
+
+            if digest != get_file_digest(path):
+                return None
+        except OSError:
+            return None
+
+        return content
+
+    def clear(self) -> None:
+        """
+        Remove every cached content.
+        """
+
+        self.__entries.clear()
+
+
+# Every parsed file cache, so they can be emptied after the execution
+PARSED_FILE_CACHES: "WeakSet[ParsedFileCache]" = WeakSet()
+
+
+def clear_parsed_file_caches() -> None:
+    """
+    Remove every cached content of every parsed file cache, so the parsed
+    files are not kept in memory after the execution.
+    """
+
+    for cache in PARSED_FILE_CACHES:
+        cache.clear()
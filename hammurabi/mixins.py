@@ -94,7 +94,7 @@ class GitMixin:
         """
 
         if self.__can_proceed():
-            logging.debug('Git add "%s"', str(param))
+            logging.debug('Git add "%s"', param)
             config.repo.git.add(str(param))  # pylint: disable=no-member
             self.made_changes = True
 
@@ -113,7 +113,7 @@ class GitMixin:
         """
 
         if self.__can_proceed():
-            logging.debug('Git remove "%s"', str(param))
+            logging.debug('Git remove "%s"', param)
             config.repo.index.remove(
                 (str(param),), ignore_unmatch=True, r=True
             )  # pylint: disable=no-member
@@ -5,10 +5,14 @@ pull request. All the laws registered to the pillar will be executed in the
 order of the registration.
 """
 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
-from typing import Iterable, List, Type
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
 
+from hammurabi.helpers import clear_parsed_file_caches
 from hammurabi.law import Law
 from hammurabi.mixins import GitHubMixin
 from hammurabi.notifications.base import Notification
@@ -16,6 +20,11 @@ from hammurabi.reporters.base import Reporter
 from hammurabi.reporters.json import JsonReporter
 from hammurabi.rules.base import Rule
 
+MAX_PREFETCH_WORKERS = 8
+
+# Function reading a file ahead of the execution of its rules
+FileReader = Callable[[Path], Optional[Any]]
+
 
 class Pillar(GitHubMixin):
     """
@@ -32,17 +41,27 @@ class Pillar(GitHubMixin):
 
     :param reporter_class: The reporter class used for generating the reports
     :type reporter_class: Type[Reporter]
+
+    :param notifications: Notifications sent after the pull request is opened
+    :type notifications: Iterable[Notification]
+
+    :param prefetch_files: Read the files of the rules in parallel before the
+        execution. The files of rules skipped by their preconditions or modified
+        by earlier rules are read in vain, so prefetching is disabled by default.
+    :type prefetch_files: bool
     """
 
     def __init__(
         self,
         reporter_class: Type[Reporter] = JsonReporter,
         notifications: Iterable[Notification] = (),
+        prefetch_files: bool = False,
     ) -> None:
         self.__laws: List[Law] = list()
 
         self.notifications: Iterable[Notification] = notifications
         self.reporter: Reporter = reporter_class(list())
+        self.prefetch_files = prefetch_files
 
     @property
     def laws(self) -> List[Law]:
@@ -133,6 +152,84 @@ class Pillar(GitHubMixin):
         self.__laws.append(law)
         self.reporter.laws = self.laws
 
+    @staticmethod
+    def __get_prefetch_readers() -> List[Tuple[Tuple[type, ...], FileReader]]:
+        """
+        Get the rule types which files can be prefetched, together with the
+        function reading the files. The rule modules are imported only when
+        prefetching is enabled, and the Yaml rules are skipped in case the
+        ``yaml`` extra is not installed.
+
+        :return: Returns the rule types and the functions reading their files
+        :rtype: List[Tuple[Tuple[type, ...], FileReader]]
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from hammurabi.rules.ini import IniBatch, SingleConfigFileRule, read_config_file
+
+        readers: List[Tuple[Tuple[type, ...], FileReader]] = [
+            ((SingleConfigFileRule, IniBatch), read_config_file)
+        ]
+
+        try:
+            from hammurabi.rules.yaml import (
+                SingleDocumentYamlFileRule,
+                YamlBatch,
+                read_yaml_file,
+            )
+        except ImportError:
+            logging.debug("prefetch of yaml files is skipped")
+        else:
+            readers.append(((SingleDocumentYamlFileRule, YamlBatch), read_yaml_file))
+
+        return readers
+
+    def prefetch(self) -> None:
+        """
+        Read the files of the registered ini and Yaml file based rules in
+        parallel before the execution, so the rules are not reading the files
+        one by one. Every file is read only once, even if multiple rules are
+        using it.
+
+        .. note::
+
+            The files are only read ahead, but parsed by the rules, since
+            parsing holds the GIL and would not get faster by running in
+            parallel threads. In case a file is modified after it was read
+            (for example by another rule), the rules will ignore the prefetched
+            content and read the file again.
+        """
+
+        readers = self.__get_prefetch_readers()
+        rules: Dict[Path, List[Any]] = defaultdict(list)
+        path_readers: Dict[Path, FileReader] = dict()
+
+        for law in self.laws:
+            for rule in law.get_execution_order():
+                if not isinstance(rule.param, Path):
+                    continue
+
+                for rule_types, read in readers:
+                    if isinstance(rule, rule_types):
+                        rules[rule.param].append(rule)
+                        path_readers[rule.param] = read
+                        break
+
+        if not rules:
+            return
+
+        logging.debug("Prefetching %d files", len(rules))
+        workers = min(MAX_PREFETCH_WORKERS, len(rules))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            contents = list(
+                executor.map(lambda path: path_readers[path](path), rules.keys())
+            )
+
+        for path_rules, content in zip(rules.values(), contents):
+            for rule in path_rules:
+                rule.prefetch(content)
+
     def enforce(self):
         """
         Run all the registered laws and rules one by one. This method is responsible
@@ -147,8 +244,15 @@ class Pillar(GitHubMixin):
         self.reporter.additional_data.started = datetime.now().isoformat()
         self.checkout_branch()
 
-        for law in self.laws:
-            law.enforce()
+        if self.prefetch_files:
+            self.prefetch()
+
+        try:
+            for law in self.laws:
+                law.enforce()
+        finally:
+            # The parsed files are not needed after the execution of the laws
+            clear_parsed_file_caches()
 
         changes_pushed = self.push_changes()
 
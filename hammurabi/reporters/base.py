@@ -114,7 +114,7 @@ class Reporter(ABC):
         :rtype: RuleItem
         """
 
-        logging.info('Collecting report data for "%s"', str(rule))
+        logging.info('Collecting report data for "%s"', rule)
 
         return RuleItem(
             name=rule.name,
@@ -135,7 +135,7 @@ class Reporter(ABC):
         :rtype: List[RuleItem]
         """
 
-        logging.info('Collecting report data for "%s"', str(law))
+        logging.info('Collecting report data for "%s"', law)
 
         items: List[RuleItem] = list()
 
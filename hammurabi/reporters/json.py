@@ -43,5 +43,5 @@ class JsonReporter(Reporter):
         format. The report will be written into the configured report file.
         """
 
-        logging.info('Writing report to "%s"', str(self.report_path))
+        logging.info('Writing report to "%s"', self.report_path)
         self.report_path.write_text(self._get_report().json())
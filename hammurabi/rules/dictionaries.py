@@ -14,10 +14,23 @@ from abc import ABC, abstractmethod
 from copy import deepcopy
 import logging
 from pathlib import Path
-from typing import Any, Callable, Dict, Hashable, List, MutableMapping, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from hammurabi.rules.common import SinglePathRule
-from hammurabi.rules.mixins import SelectorMixin
+from hammurabi.rules.mixins import SelectorMixin, split_selector
+
+# Returned by the lookup of a missing key, since ``None`` is a valid value
+MISSING = object()
 
 
 class SinglePathDictParsedRule(SinglePathRule, SelectorMixin):
@@ -44,8 +57,11 @@ class SinglePathDictParsedRule(SinglePathRule, SelectorMixin):
         **kwargs,
     ) -> None:
         self.selector = self.validate(key, required=True)
-        self.split_key = self.selector.split(".")
+        self.split_key: Tuple[str, ...] = self.validate(
+            split_selector(self.selector), required=True
+        )
         self.key_name: str = self.split_key[-1]
+        self.parent_keys: Tuple[str, ...] = self.split_key[:-1]
         self.loaded_data = Union[Dict[Hashable, Any], List[Any], None]
         self.loader = loader
 
@@ -61,7 +77,7 @@ class SinglePathDictParsedRule(SinglePathRule, SelectorMixin):
 
         # Get the parent for modifications. If there is no parent,
         # then the parent is the document root
-        return self.get_by_selector(self.loaded_data, self.split_key[:-1])
+        return self.get_by_selector(self.loaded_data, self.parent_keys)
 
     def _write_dump(self, data: Any, delete: bool = False) -> None:
         """
@@ -158,14 +174,13 @@ class DictKeyExists(SinglePathDictParsedRule, ABC):
 
         parent = self._get_parent()
 
-        logging.debug(
-            'Set default value "%s" for "%s" if no value set', self.key_name, self.value
-        )
-        inserted = parent.setdefault(self.key_name, self.value)
-
         # Only write the changes if we did any change
-        if inserted == parent[self.key_name]:
-            self._write_dump(inserted)
+        if self.key_name not in parent:
+            logging.debug('Adding key "%s" with value "%s"', self.key_name, self.value)
+            # The parsed document may be reused by the next rules, so it must
+            # not share the value with the rule or other documents
+            value = parent[self.key_name] = deepcopy(self.value)
+            self._write_dump(value)
 
         return self.param
 
@@ -207,9 +222,8 @@ class DictKeyNotExists(SinglePathDictParsedRule, ABC):
 
         parent = self._get_parent()
 
-        if self.key_name in parent.keys():
-            logging.debug('Removing key "%s"', self.key_name)
-            parent.pop(self.key_name)
+        if parent.pop(self.key_name, MISSING) is not MISSING:
+            logging.debug('Removed key "%s"', self.key_name)
             self._write_dump(parent, delete=True)
 
         return self.param
@@ -284,8 +298,7 @@ class DictKeyRenamed(SinglePathDictParsedRule, ABC):
             raise LookupError(f'No matching key for "{self.selector}"')
 
         logging.debug('Renaming key from "%s" to "%s"', self.key_name, self.new_name)
-        parent[self.new_name] = deepcopy(parent[self.key_name])
-        parent.pop(self.key_name)
+        parent[self.new_name] = parent.pop(self.key_name)
 
         # Delete is True since we need to delete the old key
         self._write_dump(parent, delete=True)
@@ -375,44 +388,76 @@ class DictValueExists(SinglePathDictParsedRule, ABC):
         self.value = value
         super().__init__(name, path, key, **kwargs)
 
-    def _update_simple_value(self, parent: Dict[str, Any]) -> None:
+    def _update_simple_value(self, parent: Dict[str, Any], current: Any) -> bool:
         """
         Update the parent key's value by a simple value.
 
         :param parent: Parent key of the dict
         :type parent: Dict[str, Any]
+
+        :param current: The current value of the key or ``MISSING``
+        :type current: Any
+
+        :return: Returns True if the value was changed
+        :rtype: bool
         """
 
+        if current is not MISSING and current == self.value:
+            return False
+
         logging.debug('Setting "%s" to "%s"', self.key_name, self.value)
-        parent[self.key_name] = self.value
+        parent[self.key_name] = deepcopy(self.value)
+        return True
 
-    def _update_list_value(self, parent: Dict[str, Any]) -> None:
+    def _update_list_value(self, current: List[Any]) -> bool:
         """
         Update the parent key's value which is an array. Depending on the new
         value's type, the exiting list will be extended or the new value will
-        be appended to the list.
+        be appended to the list. In case the list already contains the new
+        value(s), the list is left untouched.
 
-        :param parent: Parent key of the dict
-        :type parent: Dict[str, Any]
+        :param current: The current value of the key
+        :type current: List[Any]
+
+        :return: Returns True if the value was changed
+        :rtype: bool
         """
 
         if isinstance(self.value, list):
+            if all(item in current for item in self.value):
+                return False
+
             logging.debug('Extending "%s" by "%s"', self.key_name, self.value)
-            parent[self.key_name].extend(self.value)
+            current.extend(deepcopy(self.value))
         else:
+            if self.value in current:
+                return False
+
             logging.debug('Appending "%s" to "%s"', self.value, self.key_name)
-            parent[self.key_name].append(self.value)
+            current.append(deepcopy(self.value))
 
-    def _update_dict_value(self, parent: Dict[str, Any]) -> None:
+        return True
+
+    def _update_dict_value(self, current: Dict[str, Any]) -> bool:
         """
         Update the parent key's value which is a dict.
 
-        :param parent: Parent key of the dict
-        :type parent: Dict[str, Any]
+        :param current: The current value of the key
+        :type current: Dict[str, Any]
+
+        :return: Returns True if the value was changed
+        :rtype: bool
         """
 
+        if all(
+            key in current and current[key] == value
+            for key, value in self.value.items()
+        ):
+            return False
+
         logging.debug('Updating "%s" by "%s"', self.key_name, self.value)
-        parent[self.key_name].update(self.value)
+        current.update(deepcopy(self.value))
+        return True
 
     def task(self) -> Path:
         """
@@ -438,21 +483,26 @@ class DictValueExists(SinglePathDictParsedRule, ABC):
         """
 
         parent = self._get_parent()
-        value = parent.get(self.key_name)
-
-        is_list_value = isinstance(value, list)
-        is_dict_value = isinstance(value, dict)
+        value = parent.get(self.key_name, MISSING)
 
         logging.debug('Adding value "%s" to key "%s"', self.value, self.key_name)
 
-        if self.value is None or (not is_list_value and not is_dict_value):
-            self._update_simple_value(parent)
-        elif is_list_value:
-            self._update_list_value(parent)
-        elif is_dict_value:
-            self._update_dict_value(parent)
+        # The value is looked up once and passed to the update, which either
+        # modifies it in place or replaces it by a copy of the new value. The
+        # parsed document may be reused by the next rules, so it must not
+        # share any value with the rule or other documents
+        if self.value is not None and isinstance(value, list):
+            changed = self._update_list_value(value)
+        elif self.value is not None and isinstance(value, dict):
+            changed = self._update_dict_value(value)
+        else:
+            changed = self._update_simple_value(parent, value)
+            value = parent[self.key_name]
+
+        # Only write the changes if we did any change
+        if changed:
+            self._write_dump(value)
 
-        self._write_dump(parent[self.key_name])
         return self.param
 
 
@@ -523,26 +573,29 @@ class DictValueNotExists(SinglePathDictParsedRule, ABC):
 
         parent = self._get_parent()
 
-        value = parent.get(self.key_name)
-        value_contains = value and self.value in value
+        value = parent.get(self.key_name, MISSING)
 
-        if self.key_name not in parent:
+        if value is MISSING:
             return self.param
 
         write_needed = False
         logging.debug('Removing "%s" from key "%s"', self.value, self.key_name)
 
+        # The containment is checked only for the matching type, so long
+        # lists are not scanned when the value is replaced anyway
         if self.value == value:
-            parent[self.key_name] = None
-            write_needed = True
-        elif isinstance(value, list) and value_contains:
-            parent[self.key_name].remove(self.value)
-            write_needed = True
-        elif isinstance(value, dict) and value_contains:
-            del parent[self.key_name][self.value]
+            value = parent[self.key_name] = None
             write_needed = True
+        elif isinstance(value, list):
+            if self.value in value:
+                value.remove(self.value)
+                write_needed = True
+        elif isinstance(value, dict):
+            if self.value in value:
+                del value[self.value]
+                write_needed = True
 
         if write_needed:
-            self._write_dump(parent[self.key_name])
+            self._write_dump(value)
 
         return self.param
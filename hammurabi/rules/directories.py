@@ -48,7 +48,7 @@ class DirectoryExists(SinglePathRule):
         :rtype: Path
         """
 
-        logging.debug('Creating directory "%s" if not exists', str(self.param))
+        logging.debug('Creating directory "%s" if not exists', self.param)
         self.param.mkdir()
 
         return self.param
@@ -97,7 +97,7 @@ class DirectoryNotExists(SinglePathRule):
         """
 
         if self.param.exists():
-            logging.debug('Removing directory "%s"', str(self.param))
+            logging.debug('Removing directory "%s"', self.param)
             shutil.rmtree(self.param)
 
         return self.param
@@ -144,11 +144,11 @@ class DirectoryEmptied(SinglePathRule):
         with os.scandir(self.param) as entries:
             for entry in map(Path, entries):
                 if entry.is_file() or entry.is_symlink():
-                    logging.debug('Removing file "%s"', str(entry))
+                    logging.debug('Removing file "%s"', entry)
                     entry.unlink()
 
                 elif entry.is_dir():
-                    logging.debug('Removing directory "%s"', str(entry))
+                    logging.debug('Removing directory "%s"', entry)
                     shutil.rmtree(entry)
 
         return self.param
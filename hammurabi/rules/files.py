@@ -48,7 +48,7 @@ class FileExists(SinglePathRule):
         :rtype: Path
         """
 
-        logging.debug('Creating file "%s" if not exists', str(self.param))
+        logging.debug('Creating file "%s" if not exists', self.param)
         self.param.touch()
 
         return self.param
@@ -95,7 +95,7 @@ class FilesExist(MultiplePathRule):
         """
 
         for path in self.param:
-            logging.debug('Creating file "%s" if not exists', str(path))
+            logging.debug('Creating file "%s" if not exists', path)
             path.touch()
 
         return self.param
@@ -145,7 +145,7 @@ class FileNotExists(SinglePathRule):
         """
 
         if self.param.exists():
-            logging.debug('Removing "%s"', str(self.param))
+            logging.debug('Removing "%s"', self.param)
             self.param.unlink()
 
         return self.param
@@ -201,7 +201,7 @@ class FilesNotExist(MultiplePathRule):
 
         for path in self.param:
             if path.exists():
-                logging.debug('Removing "%s"', str(path))
+                logging.debug('Removing "%s"', path)
                 path.unlink()
 
         return self.param
@@ -244,7 +244,7 @@ class FileEmptied(SinglePathRule):
         :rtype: Path
         """
 
-        logging.debug('Emptying "%s"', str(self.param))
+        logging.debug('Emptying "%s"', self.param)
         self.param.write_text("")
 
         return self.param
@@ -6,13 +6,115 @@ parsed, then the modifications are made on the already parsed file.
 
 from abc import abstractmethod
 import logging
+import mmap
 from pathlib import Path
-from typing import Any, Iterable, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Tuple
+
+from hammurabi.helpers import (
+    FileSignature,
+    ParsedFileCache,
+    atomic_write,
+    get_file_signature,
+)
+from hammurabi.rules.common import SinglePathRule
 
-from configupdater import ConfigUpdater  # type: ignore
-from configupdater.configupdater import Section  # type: ignore
+if TYPE_CHECKING:  # pragma: no cover
+    from configupdater.configupdater import Section  # type: ignore
 
-from hammurabi.rules.common import SinglePathRule
+# The updater class is imported on first use by ``_get_updater_class``, so
+# pillars without ini rules do not pay the price of importing configupdater.
+ConfigUpdater: Any = None  # pylint: disable=invalid-name
+
+
+def _get_updater_class() -> Any:
+    """
+    Import the ``ConfigUpdater`` class on first use and return it.
+
+    :raises: ``ImportError`` if the ``ini`` extra is not installed
+    :return: Returns the ``ConfigUpdater`` class
+    :rtype: Any
+    """
+
+    global ConfigUpdater  # pylint: disable=global-statement,invalid-name
+
+    if ConfigUpdater is None:
+        try:
+            # pylint: disable=import-outside-toplevel
+            from configupdater import ConfigUpdater as updater_class  # type: ignore
+        except ImportError as exc:
+            raise ImportError(
+                'Ini file based rules require the "ini" extra to be installed'
+            ) from exc
+
+        ConfigUpdater = updater_class
+
+    return ConfigUpdater
+
+
+# Content of a configuration file read ahead of the execution, prefixed by
+# the signature of the file at the time of read.
+PrefetchedConfig = Tuple[FileSignature, str]
+
+# Configurations written by the rules, reused by the next rule of the file
+PARSED_CONFIGS = ParsedFileCache()
+
+
+def read_config_file(path: Path) -> Optional[PrefetchedConfig]:
+    """
+    Read the configuration file ahead of the execution of the rules. The
+    read content can be passed to the rules by their ``prefetch`` method.
+
+    :param path: Path of the configuration file
+    :type path: Path
+
+    :return: Returns the signature and content of the file or None if the
+        file cannot be read
+    :rtype: Optional[PrefetchedConfig]
+    """
+
+    try:
+        return get_file_signature(path), path.read_text()
+    except OSError:
+        return None
+
+
+def _load_config(
+    path: Path, updater: Any, prefetched: Optional[PrefetchedConfig] = None
+) -> Any:
+    """
+    Parse the configuration file by the given updater, or reuse the parsed
+    configuration left behind by the previous rule targeting the file. In
+    case the file was read ahead and it was not modified since then, the
+    read content is parsed.
+
+    :param path: Path of the configuration file
+    :type path: Path
+
+    :param updater: The updater parsing the file if it cannot be reused
+    :type updater: ConfigUpdater
+
+    :param prefetched: The signature and content of the file read ahead
+    :type prefetched: Optional[PrefetchedConfig]
+
+    :return: Returns the updater holding the parsed configuration
+    :rtype: ConfigUpdater
+    """
+
+    parsed_updater = PARSED_CONFIGS.take(path)
+
+    if parsed_updater is not None:
+        logging.debug('Using parsed configuration of "%s"', path)
+        return parsed_updater
+
+    if prefetched is not None and prefetched[0] == get_file_signature(path):
+        logging.debug('Using prefetched content of "%s"', path)
+        content = prefetched[1]
+    else:
+        content = path.read_text()
+
+    logging.debug('Parsing "%s" configuration file', path)
+    updater.read_string(content, source=str(path))
+    return updater
 
 
 class SingleConfigFileRule(SinglePathRule):
@@ -33,17 +135,164 @@ class SingleConfigFileRule(SinglePathRule):
         **kwargs,
     ) -> None:
         self.section = self.validate(section, required=True)
-        self.updater = ConfigUpdater()
+        self.updater = _get_updater_class()()
+
+        # Set by the tasks when the parsed configuration is modified, so the
+        # file is serialized and written back only if it is necessary.
+        self._dirty = False
+
+        # Set when the rule is used as an operation of a batch, so the
+        # batch is responsible for writing the configuration.
+        self._deferred_write = False
+
+        self._prefetched: Optional[PrefetchedConfig] = None
 
         super().__init__(name, path, **kwargs)
 
+    @classmethod
+    def as_operation(cls, **kwargs) -> Callable[[Any], bool]:
+        """
+        Create an operation from the rule which can be applied on an already
+        parsed configuration by :class:`hammurabi.rules.ini.IniBatch`. The
+        keyword arguments are passed to the rule, except the ``path`` which
+        is given by the batch. If no ``name`` is given, the name of the rule
+        class is used.
+
+        The returned operation accepts the parsed configuration and returns
+        True if it modified the configuration.
+
+        :return: Returns the operation representing the rule
+        :rtype: Callable[[ConfigUpdater], bool]
+        """
+
+        kwargs.setdefault("name", cls.__name__)
+        rule = cls(**kwargs)
+        rule._deferred_write = True  # pylint: disable=protected-access
+
+        def operation(updater: Any) -> bool:
+            rule.updater = updater
+            rule._dirty = False  # pylint: disable=protected-access
+            rule.task()
+            return rule._dirty  # pylint: disable=protected-access
+
+        return operation
+
     def pre_task_hook(self) -> None:
         """
-        Parse the configuration file for later use.
+        Parse the configuration file for later use. In case the previous rule
+        targeting the file left its parsed configuration behind, that is used
+        instead of parsing the file again.
         """
 
-        logging.debug('Parsing "%s" configuration file', self.param)
-        self.updater.read(self.param)
+        self._dirty = False
+        prefetched, self._prefetched = self._prefetched, None
+        self.updater = _load_config(self.param, self.updater, prefetched)
+
+    def _skip_parsing(self) -> None:
+        """
+        Reset the state left behind by a previous execution of the rule when
+        the parsing of the configuration file is skipped, so the rule works on
+        an empty configuration instead of a stale one.
+        """
+
+        self._dirty = False
+        self._prefetched = None
+        self.updater = _get_updater_class()()
+
+    def prefetch(self, prefetched: Optional[PrefetchedConfig]) -> None:
+        """
+        Set the content of the configuration file read ahead of the execution
+        by :func:`hammurabi.rules.ini.read_config_file`. The content is used
+        only if the file was not modified since it was read.
+
+        :param prefetched: The signature and content of the file
+        :type prefetched: Optional[PrefetchedConfig]
+        """
+
+        self._prefetched = prefetched
+
+    def _write_config(self) -> None:
+        """
+        Write the parsed configuration back to the file. In case the
+        configuration was not modified, the write is skipped.
+        """
+
+        if self._deferred_write:
+            return
+
+        if not self._dirty:
+            logging.debug('No changes made on "%s", skipping write', self.param)
+            return
+
+        with atomic_write(self.param) as file:
+            self.updater.write(file)
+
+        PARSED_CONFIGS.put(self.param, self.updater)
+
+    def _section_header_exists(self) -> bool:
+        """
+        Scan the raw file content for the header of the section without
+        parsing the file. A match does not guarantee that the section exists
+        (the header may be part of a comment for example), but a miss means
+        that the section is surely not in the file.
+
+        :return: Returns True if the section header can be found in the file
+        :rtype: bool
+        """
+
+        with self.param.open("rb") as file:
+            # Empty files cannot be memory-mapped
+            if not self.param.stat().st_size:
+                return False
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return content.find(f"[{self.section}]".encode()) != -1
+
+    def _set_options(
+        self,
+        section: "Section",
+        keys: Iterable[str],
+        options: Iterable[Tuple[str, Any]],
+        force_value: bool = True,
+    ) -> None:
+        """
+        Set the given options of the section in one pass. The existing options
+        are indexed once, new options are appended to the end of the section
+        directly, so the section is not scanned again for every option.
+
+        :param section: The parsed section to update
+        :type section: Section
+
+        :param keys: Normalized keys of the options
+        :type keys: Iterable[str]
+
+        :param options: Option name and value pairs to set
+        :type options: Iterable[Tuple[str, Any]]
+
+        :param force_value: Overwrite the value of already existing options
+        :type force_value: bool
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from configupdater.configupdater import Option  # type: ignore
+
+        existing_options = {option.key: option for option in section.option_blocks()}
+
+        for key, (option, value) in zip(keys, options):
+            existing = existing_options.get(key)
+
+            if existing is not None and (not force_value or existing.value == value):
+                continue
+
+            logging.debug('Adding option "%s" = "%s"', option, value)
+
+            if existing is None:
+                existing = Option(option, value, container=section)
+                section.add_option(existing)
+                existing_options[key] = existing
+
+            existing.value = value
+            self._dirty = True
 
     @abstractmethod
     def task(self) -> Any:
@@ -128,37 +377,48 @@ class SectionExists(SingleConfigFileRule):
         **kwargs,
     ) -> None:
         self.match = match
-        self.options = options
+        self.options = tuple(options)
         self.add_after = add_after
 
         self.space = 1
 
         super().__init__(name, path, **kwargs)
 
-    def __get_match(self) -> Optional[Section]:
+        self._option_keys = tuple(
+            self.updater.optionxform(option) for option, _ in self.options
+        )
+
+    def __get_match(self, sections: List["Section"]) -> Optional["Section"]:
         """
         Get the match of the insert. If the match is not
         specified directly add as the last section.
+
+        :param sections: The section blocks of the parsed file
+        :type sections: List[Section]
         """
 
-        if not self.updater.sections():
+        if not sections:
             return None
 
-        if self.updater.has_section(self.match):
-            return self.updater[self.match]
+        for section in sections:
+            if section.name == self.match:
+                return section
 
-        return self.updater.section_blocks()[-1]
+        return sections[-1]
 
-    def __add_section(self) -> None:
+    def __add_section(self, sections: List["Section"]) -> None:
         """
         Add the desired section before or after the match section if exists.
         In case the match section not exists, so the file was empty, simply
         add the new section.
+
+        :param sections: The section blocks of the parsed file
+        :type sections: List[Section]
         """
 
         logging.debug('Adding section "%s"', self.section)
 
-        match = self.__get_match()
+        match = self.__get_match(sections)
 
         if match is not None and self.add_after:
             match.add_after.space(self.space).section(self.section)
@@ -167,13 +427,36 @@ class SectionExists(SingleConfigFileRule):
         else:
             self.updater.add_section(self.section)
 
-    def __add_options(self) -> None:
+        self._dirty = True
+
+    def __add_options(self, section: Optional["Section"]) -> None:
         """
         Add options to the given section.
+
+        :param section: The section if it was found before, otherwise it
+            is looked up by its name
+        :type section: Optional[Section]
+        """
+
+        if self.options:
+            if section is None:
+                section = self.updater[self.section]
+
+            self._set_options(section, self._option_keys, self.options)
+
+    def pre_task_hook(self) -> None:
         """
+        Parse the configuration file for later use. In case the file is empty
+        or does not exist, there is nothing to parse, so the parsing is skipped
+        and the section will be created from scratch.
+        """
+
+        if not self.param.exists() or not self.param.stat().st_size:
+            logging.debug('"%s" is empty, skip parsing', self.param)
+            self._skip_parsing()
+            return
 
-        for option, value in self.options:
-            self.updater[self.section][option] = value
+        super().pre_task_hook()
 
     def task(self) -> Path:
         """
@@ -184,13 +467,16 @@ class SectionExists(SingleConfigFileRule):
         :rtype: Path
         """
 
-        if not self.updater.has_section(self.section):
-            self.__add_section()
+        # Collect the section blocks only once, since every lookup on the
+        # updater (including ``has_section``) would build the list again.
+        sections = self.updater.section_blocks()
+        section = next((s for s in sections if s.name == self.section), None)
 
-        self.__add_options()
+        if section is None:
+            self.__add_section(sections)
 
-        with self.param.open("w") as file:
-            self.updater.write(file)
+        self.__add_options(section)
+        self._write_config()
 
         return self.param
 
@@ -225,6 +511,19 @@ class SectionNotExists(SingleConfigFileRule):
         This rule requires the ``ini`` extra to be installed.
     """
 
+    def pre_task_hook(self) -> None:
+        """
+        Parse the configuration file for later use. In case the section
+        cannot be in the file, the parsing is skipped.
+        """
+
+        if not self._section_header_exists():
+            logging.debug('Section "%s" not found, skip parsing', self.section)
+            self._skip_parsing()
+            return
+
+        super().pre_task_hook()
+
     def task(self) -> Path:
         """
         Remove the given section including its options from the config file.
@@ -237,9 +536,9 @@ class SectionNotExists(SingleConfigFileRule):
 
             logging.debug('Removing section "%s"', self.section)
             self.updater.remove_section(self.section)
+            self._dirty = True
 
-            with self.param.open("w") as file:
-                self.updater.write(file)
+        self._write_config()
 
         return self.param
 
@@ -298,23 +597,30 @@ class SectionRenamed(SingleConfigFileRule):
         :rtype: Path
         """
 
-        has_old_section = self.updater.has_section(self.section)
-        has_new_section = self.updater.has_section(self.new_name)
+        old_section = new_section = None
+
+        # Find both sections with a single scan instead of looking them up
+        # one by one, because every lookup scans the sections again.
+        for section in self.updater.section_blocks():
+            if section.name == self.section:
+                old_section = section
+            elif section.name == self.new_name:
+                new_section = section
 
-        if has_old_section and has_new_section:
+        if old_section is not None and new_section is not None:
             raise LookupError(f'Both "{self.section}" and "{self.new_name}" set')
 
-        if has_new_section:
+        if new_section is not None:
             return self.param
 
-        if not has_old_section:
+        if old_section is None:
             raise LookupError(f'No matching section for "{self.section}"')
 
         logging.debug('Renaming "%s" to "%s"', self.section, self.new_name)
-        self.updater[self.section].name = self.new_name
+        old_section.name = self.new_name
+        self._dirty = True
 
-        with self.param.open("w") as file:
-            self.updater.write(file)
+        self._write_config()
 
         return self.param
 
@@ -368,11 +674,16 @@ class OptionsExist(SingleConfigFileRule):
         force_value: bool = False,
         **kwargs,
     ) -> None:
-        self.options = self.validate(options, required=True)
+        self.options = tuple(self.validate(options, required=True))
         self.force_value = force_value
 
         super().__init__(name, path, **kwargs)
 
+        # The options are fixed for the rule, so normalize their keys only once
+        self._option_keys = tuple(
+            self.updater.optionxform(option) for option, _ in self.options
+        )
+
     def task(self) -> Path:
         """
         Remove one or more option from a section. In case a section can not be
@@ -385,16 +696,14 @@ class OptionsExist(SingleConfigFileRule):
         :rtype: Path
         """
 
-        if not self.updater.has_section(self.section):
-            raise LookupError(f'No matching section for "{self.section}"')
+        try:
+            section = self.updater[self.section]
+        except KeyError as exc:
+            raise LookupError(f'No matching section for "{self.section}"') from exc
 
-        for option, value in self.options:
-            if not self.updater.has_option(self.section, option) or self.force_value:
-                logging.debug('Adding option "%s" = "%s"', option, value)
-                self.updater[self.section][option] = value
+        self._set_options(section, self._option_keys, self.options, self.force_value)
 
-        with self.param.open("w") as file:
-            self.updater.write(file)
+        self._write_config()
 
         return self.param
 
@@ -440,10 +749,26 @@ class OptionsNotExist(SingleConfigFileRule):
         options: Iterable[str] = (),
         **kwargs,
     ) -> None:
-        self.options = self.validate(options, required=True)
+        self.options = tuple(self.validate(options, required=True))
 
         super().__init__(name, path, **kwargs)
 
+        # The options are fixed for the rule, so normalize their keys only once
+        self._option_keys = tuple(self.updater.optionxform(o) for o in self.options)
+
+    def pre_task_hook(self) -> None:
+        """
+        Parse the configuration file for later use. In case the section
+        cannot be in the file, the parsing is skipped.
+        """
+
+        if not self._section_header_exists():
+            logging.debug('Section "%s" not found, skip parsing', self.section)
+            self._skip_parsing()
+            return
+
+        super().pre_task_hook()
+
     def task(self) -> Path:
         """
         Remove one or more option from a section. In case a section can not be
@@ -456,15 +781,23 @@ class OptionsNotExist(SingleConfigFileRule):
         :rtype: Path
         """
 
-        if not self.updater.has_section(self.section):
-            raise LookupError(f'No matching section for "{self.section}"')
+        try:
+            section = self.updater[self.section]
+        except KeyError as exc:
+            raise LookupError(f'No matching section for "{self.section}"') from exc
 
-        for option in self.options:
-            logging.debug('Removing option "%s"', option)
-            self.updater.remove_option(self.section, option)
+        # Index the existing options once instead of scanning the
+        # section for every option
+        existing_options = set(section.options())
 
-        with self.param.open("w") as file:
-            self.updater.write(file)
+        for key, option in zip(self._option_keys, self.options):
+            if key in existing_options:
+                logging.debug('Removing option "%s"', option)
+                del section[key]
+                existing_options.discard(key)
+                self._dirty = True
+
+        self._write_config()
 
         return self.param
 
@@ -526,28 +859,135 @@ class OptionRenamed(SingleConfigFileRule):
         :rtype: Path
         """
 
-        if not self.updater.has_section(self.section):
+        section = next(
+            (s for s in self.updater.section_blocks() if s.name == self.section),
+            None,
+        )
+
+        if section is None:
             raise LookupError(f'No matching section for "{self.section}"')
 
-        has_old_option = self.updater[self.section].get(self.option)
-        has_new_option = self.updater[self.section].get(self.new_name)
+        options = {option.key: option for option in section.option_blocks()}
+        old_option = options.get(self.updater.optionxform(self.option))
+        new_option = options.get(self.updater.optionxform(self.new_name))
 
-        if has_old_option and has_new_option:
+        if old_option is not None and new_option is not None:
             raise LookupError(f'Both "{self.option}" and "{self.new_name}" set')
 
-        if has_new_option:
+        if new_option is not None:
             return self.param
 
-        if not has_old_option:
+        if old_option is None:
             raise LookupError(f'No matching option for "{self.section}"')
 
         logging.debug(
             'Replacing option "%s" with "%s"', str(self.option), self.new_name
         )
 
-        self.updater[self.section][self.option].name = self.new_name
+        old_option.key = self.new_name
+        self._dirty = True
 
-        with self.param.open("w") as file:
-            self.updater.write(file)
+        self._write_config()
+
+        return self.param
+
+
+class IniBatch(SinglePathRule):
+    """
+    Apply multiple ini file modifications on a single file. The file is parsed
+    only once, then all the operations are applied in the given order on the
+    parsed configuration, and finally the configuration is written back once,
+    if any of the operations modified it.
+
+    Operations can be created from ini rules by calling their ``as_operation``
+    class method with the same keyword arguments that the rule accepts, except
+    the ``path``.
+
+    Example usage:
+
+        >>> from pathlib import Path
+        >>> from hammurabi import Law, Pillar, IniBatch, OptionsExist, SectionExists
+        >>>
+        >>> example_law = Law(
+        >>>     name="Name of the law",
+        >>>     description="Well detailed description what this law does.",
+        >>>     rules=(
+        >>>         IniBatch(
+        >>>             name="Ensure polling is configured",
+        >>>             path=Path("./config.ini"),
+        >>>             operations=(
+        >>>                 SectionExists.as_operation(section="polling"),
+        >>>                 OptionsExist.as_operation(
+        >>>                     section="polling",
+        >>>                     options=(("interval", "2s"),),
+        >>>                 ),
+        >>>             ),
+        >>>         ),
+        >>>     )
+        >>> )
+        >>>
+        >>> pillar = Pillar()
+        >>> pillar.register(example_law)
+
+    .. warning::
+
+        This rule requires the ``ini`` extra to be installed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[Path] = None,
+        operations: Iterable[Callable[[Any], bool]] = (),
+        **kwargs,
+    ) -> None:
+        self.operations = self.validate(operations, required=True)
+        self.updater = _get_updater_class()()
+        self._prefetched: Optional[PrefetchedConfig] = None
+
+        super().__init__(name, path, **kwargs)
+
+    def pre_task_hook(self) -> None:
+        """
+        Parse the configuration file for later use. In case the previous rule
+        targeting the file left its parsed configuration behind, that is used
+        instead of parsing the file again.
+        """
+
+        prefetched, self._prefetched = self._prefetched, None
+        self.updater = _load_config(self.param, self.updater, prefetched)
+
+    def prefetch(self, prefetched: Optional[PrefetchedConfig]) -> None:
+        """
+        Set the content of the configuration file read ahead of the execution
+        by :func:`hammurabi.rules.ini.read_config_file`. The content is used
+        only if the file was not modified since it was read.
+
+        :param prefetched: The signature and content of the file
+        :type prefetched: Optional[PrefetchedConfig]
+        """
+
+        self._prefetched = prefetched
+
+    def task(self) -> Path:
+        """
+        Apply all the operations on the parsed configuration and write the
+        configuration back if any of the operations modified it.
+
+        :raises: ``LookupError`` raised by the operations
+        :return: Return the input path as an output
+        :rtype: Path
+        """
+
+        modified = False
+
+        for operation in self.operations:
+            modified = operation(self.updater) or modified
+
+        if modified:
+            with atomic_write(self.param) as file:
+                self.updater.write(file)
+
+            PARSED_CONFIGS.put(self.param, self.updater)
 
         return self.param
@@ -6,9 +6,12 @@ already parsed file.
 """
 
 from abc import abstractmethod
+import logging
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Optional
 
+from hammurabi.helpers import ParsedFileCache, atomic_write, read_file_bytes
+from hammurabi.rules.common import SinglePathRule
 from hammurabi.rules.dictionaries import (
     DictKeyExists,
     DictKeyNotExists,
@@ -23,6 +26,58 @@ try:
 except ImportError:
     import json  # type: ignore
 
+# Size of the buffer used to write the dumped Json files
+WRITE_BUFFER_SIZE = 128 * 1024
+
+# Documents written by the rules, reused by the next rule of the file
+PARSED_DOCUMENTS = ParsedFileCache()
+
+
+def _load_document(path: Path, loader: Callable[[Any], Any]) -> Any:
+    """
+    Load the Json document of the file, or reuse the document left behind by
+    the previous rule targeting the file.
+
+    :param path: Path of the Json file
+    :type path: Path
+
+    :param loader: Function used to parse the content of the file
+    :type loader: Callable[[Any], Any]
+
+    :return: Returns the parsed document
+    :rtype: Any
+    """
+
+    loaded_data = PARSED_DOCUMENTS.take(path)
+
+    if loaded_data is None:
+        # The Json loaders accept bytes, so the file can be read
+        # without decoding it first
+        logging.debug('Parsing "%s" file', path)
+        return loader(read_file_bytes(path))
+
+    logging.debug('Using parsed document of "%s"', path)
+    return loaded_data
+
+
+def _dump_document(path: Path, data: Any) -> None:
+    """
+    Write the Json document into the file and keep it for the next rule.
+
+    :param path: Path of the Json file
+    :type path: Path
+
+    :param data: The document to write
+    :type data: Any
+    """
+
+    # Dump directly into the file, so the serialized document is not kept
+    # as a string next to the file buffer
+    with atomic_write(path, buffering=WRITE_BUFFER_SIZE) as file:
+        json.dump(data, file)
+
+    PARSED_DOCUMENTS.put(path, data)
+
 
 class SingleJsonFileRule(SinglePathDictParsedRule):
     """
@@ -33,8 +88,50 @@ class SingleJsonFileRule(SinglePathDictParsedRule):
     def __init__(
         self, name: str, path: Optional[Path] = None, key: str = "", **kwargs
     ) -> None:
+        # Set when the rule is used as an operation of a batch, so the
+        # batch is responsible for writing the document.
+        self._deferred_write = False
+        self._dirty = False
+
         super().__init__(name, path, key, loader=json.loads, **kwargs)
 
+    @classmethod
+    def as_operation(cls, **kwargs) -> Callable[[Any], bool]:
+        """
+        Create an operation from the rule which can be applied on an already
+        parsed document by :class:`hammurabi.rules.json.JsonBatch`. The
+        keyword arguments are passed to the rule, except the ``path`` which
+        is given by the batch. If no ``name`` is given, the name of the rule
+        class is used.
+
+        The returned operation accepts the parsed document and returns
+        True if it modified the document.
+
+        :return: Returns the operation representing the rule
+        :rtype: Callable[[Any], bool]
+        """
+
+        kwargs.setdefault("name", cls.__name__)
+        rule = cls(**kwargs)
+        rule._deferred_write = True  # pylint: disable=protected-access
+
+        def operation(loaded_data: Any) -> bool:
+            rule.loaded_data = loaded_data
+            rule._dirty = False  # pylint: disable=protected-access
+            rule.task()
+            return rule._dirty  # pylint: disable=protected-access
+
+        return operation
+
+    def pre_task_hook(self) -> None:
+        """
+        Parse the file for later use. In case the previous rule targeting the
+        file left its parsed document behind, that is used instead of parsing
+        the file again.
+        """
+
+        self.loaded_data = _load_document(self.param, self.loader)
+
     def _write_dump(self, data: Any, delete: bool = False) -> None:
         """
         Helper function to write the dump into file.
@@ -46,12 +143,16 @@ class SingleJsonFileRule(SinglePathDictParsedRule):
         :type delete: bool
         """
 
-        self.param.write_text(
-            json.dumps(
-                self.set_by_selector(self.loaded_data, self.split_key, data, delete)
-            )
+        updated_data = self.set_by_selector(
+            self.loaded_data, self.split_key, data, delete
         )
 
+        if self._deferred_write:
+            self._dirty = True
+            return
+
+        _dump_document(self.param, updated_data)
+
     @abstractmethod
     def task(self) -> Path:
         """
@@ -270,3 +371,84 @@ class JsonValueNotExists(DictValueNotExists, SingleJsonFileRule):
         >>> pillar = Pillar()
         >>> pillar.register(example_law)
     """
+
+
+class JsonBatch(SinglePathRule):
+    """
+    Apply multiple Json file modifications on a single file. The file is parsed
+    only once, then all the operations are applied in the given order on the
+    parsed document, and finally the document is written back once, if any
+    of the operations modified it.
+
+    Operations can be created from Json rules by calling their ``as_operation``
+    class method with the same keyword arguments that the rule accepts, except
+    the ``path``.
+
+    Example usage:
+
+        >>> from pathlib import Path
+        >>> from hammurabi import Law, Pillar
+        >>> from hammurabi import JsonBatch, JsonKeyExists, JsonKeyNotExists
+        >>>
+        >>> example_law = Law(
+        >>>     name="Name of the law",
+        >>>     description="Well detailed description what this law does.",
+        >>>     rules=(
+        >>>         JsonBatch(
+        >>>             name="Ensure service descriptor is up to date",
+        >>>             path=Path("./service.json"),
+        >>>             operations=(
+        >>>                 JsonKeyExists.as_operation(key="stack", value="python"),
+        >>>                 JsonKeyNotExists.as_operation(key="outdated_key"),
+        >>>             ),
+        >>>         ),
+        >>>     )
+        >>> )
+        >>>
+        >>> pillar = Pillar()
+        >>> pillar.register(example_law)
+
+    .. note::
+
+        The root of the document must be an object, since every operation
+        is working on the keys of the document.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[Path] = None,
+        operations: Iterable[Callable[[Any], bool]] = (),
+        **kwargs,
+    ) -> None:
+        self.operations = self.validate(operations, required=True)
+        self.loaded_data: Any = None
+
+        super().__init__(name, path, **kwargs)
+
+    def pre_task_hook(self) -> None:
+        """
+        Parse the file for later use.
+        """
+
+        self.loaded_data = _load_document(self.param, json.loads)
+
+    def task(self) -> Path:
+        """
+        Apply all the operations on the parsed document and write the
+        document back if any of the operations modified it.
+
+        :raises: ``LookupError`` raised by the operations
+        :return: Return the input path as an output
+        :rtype: Path
+        """
+
+        modified = False
+
+        for operation in self.operations:
+            modified = operation(self.loaded_data) or modified
+
+        if modified:
+            _dump_document(self.param, self.loaded_data)
+
+        return self.param
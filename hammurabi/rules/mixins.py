@@ -1,4 +1,26 @@
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+import sys
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+# Path to a key, either as a selector or as the already split keys
+KeyPath = Union[str, List[str], Tuple[str, ...]]
+
+
+@lru_cache(maxsize=1024)
+def split_selector(selector: str) -> Tuple[str, ...]:
+    """
+    Split the selector to keys. Rules are usually sharing a small set of
+    selectors, so the result is cached. The keys are interned, therefore
+    looking them up in the parsed documents can compare them by identity.
+
+    :param selector: Path to the key in a selector format (``.path.to.the.key``)
+    :type selector: str
+
+    :return: Tuple of the keys
+    :rtype: Tuple[str, ...]
+    """
+
+    return tuple(sys.intern(key) for key in selector.split(".") if key)
 
 
 class SelectorMixin:  # pylint: disable=too-few-public-methods
@@ -8,27 +30,29 @@ class SelectorMixin:  # pylint: disable=too-few-public-methods
     """
 
     @staticmethod
-    def __normalize_key_path(key_path: Union[str, List[str]]) -> List[str]:
+    def __normalize_key_path(key_path: KeyPath) -> Sequence[str]:
         """
         Normalize the key_path and make sure we return the list
-        representation of it.
+        representation of it. Tuples are considered already normalized
+        and returned as is.
 
         :param key_path: Path to the key in a selector format
             (``.path.to.the.key`` or ``["path", "to", "the", "key"]``)
-        :type key_path: Union[str, List[str]]
+        :type key_path: KeyPath
 
         :return: List representation of key type
-        :rtype: List[str]
+        :rtype: Sequence[str]
         """
 
+        if isinstance(key_path, tuple):
+            return key_path
+
         if isinstance(key_path, str):
-            key_path = key_path.split(".")
+            return split_selector(key_path)
 
-        return list(filter(lambda key: key, key_path))
+        return [key for key in key_path if key]
 
-    def get_by_selector(
-        self, data: Any, key_path: Union[str, List[str]]
-    ) -> Dict[str, Any]:
+    def get_by_selector(self, data: Any, key_path: KeyPath) -> Dict[str, Any]:
         """
         Get a key's value by a selector and traverse the path.
 
@@ -37,7 +61,7 @@ class SelectorMixin:  # pylint: disable=too-few-public-methods
 
         :param key_path: Path to the key in a selector format
             (``.path.to.the.key`` or ``["path", "to", "the", "key"]``)
-        :type key_path: Union[str, List[str]]
+        :type key_path: KeyPath
 
         :return: Return the value belonging to the selector
         :rtype: :class:`hammurabi.rules.mixins.Any`
@@ -46,10 +70,9 @@ class SelectorMixin:  # pylint: disable=too-few-public-methods
         if not data:
             return dict()
 
-        key_path = self.__normalize_key_path(key_path)
-        entry = data or dict()
+        entry = data
 
-        for item in key_path:
+        for item in self.__normalize_key_path(key_path):
             entry = entry.get(item, None)
             if not entry:
                 return dict()
@@ -59,7 +82,7 @@ class SelectorMixin:  # pylint: disable=too-few-public-methods
     def set_by_selector(
         self,
         loaded_data: Any,
-        key_path: Union[str, List[str]],
+        key_path: KeyPath,
         value: Union[None, list, dict, str, int, float],
         delete: bool = False,
     ) -> Any:
@@ -71,7 +94,7 @@ class SelectorMixin:  # pylint: disable=too-few-public-methods
 
         :param key_path: Path to the key in a selector format
             (``.path.to.the.key`` or ``["path", "to", "the", "key"]``)
-        :type key_path: Union[str, List[str]]
+        :type key_path: KeyPath
 
         :param value: The value set for the key
         :type value: Union[None, list, dict, str, int, float]
@@ -84,17 +107,18 @@ class SelectorMixin:  # pylint: disable=too-few-public-methods
         """
 
         key_path = self.__normalize_key_path(key_path)
-        data: Dict[str, Any] = loaded_data or dict()
+        data: Dict[str, Any] = loaded_data if loaded_data is not None else dict()
 
         entry = data
 
         for item in key_path[:-1]:
             current = entry.get(item)
 
-            if current and not isinstance(current, dict):
-                entry[item] = {}
+            # Replace anything on the path which cannot hold the key
+            if not isinstance(current, dict):
+                current = entry[item] = {}
 
-            entry = entry.setdefault(item, {})
+            entry = current
 
         if not delete:
             entry[key_path[-1]] = value
@@ -8,6 +8,7 @@ from pathlib import Path
 import shutil
 from typing import Optional
 
+from hammurabi.helpers import copy_file, copy_tree
 from hammurabi.rules.common import SinglePathRule
 
 
@@ -66,8 +67,11 @@ class Moved(SinglePathRule):
         :rtype: Path
         """
 
-        logging.debug('Moving "%s" to "%s"', str(self.param), str(self.destination))
-        shutil.move(self.param, self.destination)
+        logging.debug('Moving "%s" to "%s"', self.param, self.destination)
+
+        # Moving is a rename within the same file system, the content is
+        # copied only across file systems, when the kernel copy is preferred
+        shutil.move(self.param, self.destination, copy_function=copy_file)
 
         return self.destination
 
@@ -111,6 +115,21 @@ class Renamed(Moved):
         destination = Path((path or self.param).parent, path_name)
         super().__init__(name, path, destination, **kwargs)
 
+    def task(self) -> Path:
+        """
+        Rename the given path. Since the destination is in the same
+        directory, a single rename is enough and the checks of a move
+        across file systems are skipped.
+
+        :return: Returns the new path of the file/directory
+        :rtype: Path
+        """
+
+        logging.debug('Renaming "%s" to "%s"', self.param, self.destination)
+        self.param.rename(self.destination)
+
+        return self.destination
+
 
 class Copied(SinglePathRule):
     """
@@ -164,11 +183,11 @@ class Copied(SinglePathRule):
         :rtype: Path
         """
 
-        logging.debug('Copying "%s" to "%s"', str(self.param), str(self.destination))
+        logging.debug('Copying "%s" to "%s"', self.param, self.destination)
 
         if self.param.is_dir():
-            shutil.copytree(self.param, self.destination)
+            copy_tree(self.param, self.destination)
         else:
-            shutil.copy2(self.param, self.destination)
+            copy_file(self.param, self.destination)
 
         return self.destination
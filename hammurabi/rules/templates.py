@@ -5,12 +5,42 @@ file based on a Jinja2 template by rendering it.
 
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from jinja2 import Template
 
+from hammurabi.helpers import FileSignature, atomic_write, get_file_signature
 from hammurabi.rules.common import SinglePathRule
 
+# Compiled templates with the signature of the template file they were
+# compiled from, keyed by the path of the template file
+COMPILED_TEMPLATES: Dict[Path, Tuple[FileSignature, Template]] = dict()
+
+
+def get_template(path: Path) -> Template:
+    """
+    Get the compiled template of the given template file. The template is
+    compiled only once and reused by every rule rendering it, unless the
+    template file is modified.
+
+    :param path: Path of the template file
+    :type path: Path
+
+    :return: Returns the compiled template
+    :rtype: Template
+    """
+
+    signature = get_file_signature(path)
+    entry = COMPILED_TEMPLATES.get(path)
+
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    template = Template(path.read_text())
+    COMPILED_TEMPLATES[path] = (signature, template)
+
+    return template
+
 
 class TemplateRendered(SinglePathRule):
     """
@@ -75,8 +105,13 @@ class TemplateRendered(SinglePathRule):
         :rtype: Path
         """
 
-        logging.debug('Rendering template "%s"', str(self.param))
-        rendered = Template(self.param.read_text()).render(self.context)
-        self.destination.write_text(rendered)
+        logging.debug('Rendering template "%s"', self.param)
+        stream = get_template(self.param).stream(self.context)
+
+        # The rendered content is written while rendering, so the whole
+        # content is never held in memory; the destination is replaced only
+        # if the rendering succeeded
+        with atomic_write(self.destination, "wb") as file:
+            stream.dump(file, encoding="utf-8")
 
         return self.destination
@@ -8,15 +8,191 @@ created.
 """
 
 
+from abc import abstractmethod
+from functools import lru_cache
 import logging
 from pathlib import Path
 import re
-from typing import List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Pattern
 
 from hammurabi.rules.common import SinglePathRule
 
+# Characters having special meaning in regular expressions
+REGEX_SPECIAL_CHARACTERS = frozenset(".^$*+?{}[]\\|()")
 
-class LineExists(SinglePathRule):
+# Flags changing how the literal characters of a pattern are matched
+LITERAL_CHANGING_FLAGS = re.IGNORECASE | re.VERBOSE
+
+# Default pattern of the line rules to extract the indentation of a line
+INDENTATION_PATTERN = re.compile(r"^\s+")
+
+
+@lru_cache(maxsize=512)
+def _get_literal_prefix(pattern: Pattern) -> str:
+    """
+    Get the literal text every string must start with to be matched by the
+    given pattern using ``re.match``. The prefix can be checked by the much
+    cheaper ``str.startswith`` before matching the pattern. Rules are usually
+    sharing a small set of patterns, so the result is cached.
+
+    :param pattern: The compiled regular expression
+    :type pattern: Pattern
+
+    :return: Returns the literal prefix of the pattern, or an empty string
+        if the pattern has no such prefix
+    :rtype: str
+    """
+
+    source = pattern.pattern
+
+    # Case insensitive or verbose patterns may match strings not starting
+    # with the literal text, and inline flags can set the same flags
+    if pattern.flags & LITERAL_CHANGING_FLAGS or source.startswith("(?"):
+        return ""
+
+    # Alternations may have different prefixes for every branch
+    if "|" in source:
+        return ""
+
+    prefix: List[str] = []
+
+    for char in source[1:] if source.startswith("^") else source:
+        if char in REGEX_SPECIAL_CHARACTERS:
+            # The quantifier makes the previous character optional
+            if char in "*?{" and prefix:
+                prefix.pop()
+
+            break
+
+        prefix.append(char)
+
+    return "".join(prefix)
+
+
+def _join_lines(lines: List[str]) -> str:
+    """
+    Join the lines to the content of a file, terminating every line by a
+    new line character. The content is built at once, so it can be written
+    by a single call instead of writing the lines one by one.
+
+    :param lines: Lines of the file
+    :type lines: List[str]
+
+    :return: Returns the content of the file
+    :rtype: str
+    """
+
+    if not lines:
+        return ""
+
+    return "\n".join(lines) + "\n"
+
+
+def _get_indentation(line: str, pattern: Pattern) -> str:
+    """
+    Get the indentation of the line extracted by the given pattern. For the
+    default pattern, the leading whitespace is found by ``str.lstrip``
+    instead of running the regular expression.
+
+    :param line: The line to get the indentation of
+    :type line: str
+
+    :param pattern: Pattern extracting the indentation
+    :type pattern: Pattern
+
+    :return: Returns the indentation or an empty string if there is none
+    :rtype: str
+    """
+
+    if pattern is INDENTATION_PATTERN:
+        return line[: len(line) - len(line.lstrip())]
+
+    indentation = pattern.match(line)
+    return indentation.group() if indentation else ""
+
+
+class SingleTextFileRule(SinglePathRule):
+    """
+    Extend :class:`hammurabi.rules.common.SinglePathRule` to handle line
+    based manipulations on a single text file. The file is read as lines,
+    the lines are modified by :func:`modify_lines`, and the file is written
+    back only if the lines were modified.
+    """
+
+    @classmethod
+    def as_operation(cls, **kwargs) -> Callable[[List[str]], bool]:
+        """
+        Create an operation from the rule which can be applied on the already
+        read lines by :class:`hammurabi.rules.text.LineBatch`. The keyword
+        arguments are passed to the rule, except the ``path`` which is given
+        by the batch. If no ``name`` is given, the name of the rule class
+        is used.
+
+        The returned operation accepts the lines and returns True if it
+        modified the lines.
+
+        :return: Returns the operation representing the rule
+        :rtype: Callable[[List[str]], bool]
+        """
+
+        kwargs.setdefault("name", cls.__name__)
+        return cls(**kwargs).modify_lines
+
+    def _read_lines(self) -> List[str]:
+        """
+        Read the lines of the given file.
+
+        :return: Returns the lines of the file
+        :rtype: List[str]
+        """
+
+        with self.param.open("r") as file:
+            logging.debug('Reading from "%s"', self.param)
+            return file.read().splitlines()
+
+    def _write_lines(self, lines: List[str]) -> None:
+        """
+        Write the modified lines back to the given file.
+
+        :param lines: The new content of the original file
+        :type lines: List[str]
+        """
+
+        with self.param.open("w") as file:
+            file.write(_join_lines(lines))
+
+    @abstractmethod
+    def modify_lines(self, lines: List[str]) -> bool:
+        """
+        Modify the lines of the file in place.
+
+        :param lines: Lines of the file
+        :type lines: List[str]
+
+        :return: Returns True if the lines were modified
+        :rtype: bool
+        """
+
+    def task(self) -> Path:
+        """
+        Read the lines of the given file, modify them and write the file back
+        if any modification was made.
+
+        :raises: ``LookupError`` raised by :func:`modify_lines`
+
+        :return: Returns the path of the modified file
+        :rtype: Path
+        """
+
+        lines = self._read_lines()
+
+        if self.modify_lines(lines):
+            self._write_lines(lines)
+
+        return self.param
+
+
+class LineExists(SingleTextFileRule):
     """
     Make sure that the given file contains the required line. This rule is
     capable for inserting the expected text before or after the unique match
@@ -72,6 +248,10 @@ class LineExists(SinglePathRule):
         inherit from this class.
     """
 
+    # Extracts the indentation of a line, override it in subclasses if a more
+    # complex pattern is required
+    indentation_pattern = INDENTATION_PATTERN
+
     def __init__(
         self,
         name: str,
@@ -85,120 +265,103 @@ class LineExists(SinglePathRule):
     ) -> None:
         self.text = self.validate(text, required=True)
         self.match = re.compile(self.validate(match, required=True))
+        self.match_prefix = _get_literal_prefix(self.match)
         self.position = position
         self.respect_indentation = respect_indentation
-
-        self.indentation_pattern = re.compile(r"^\s+")
         self.ensure_trailing_newline = ensure_trailing_newline
 
         super().__init__(name, path, **kwargs)
 
-    def __get_match(self, lines: List[str]) -> str:
+    def __get_match_index(self, lines: List[str]) -> int:
         """
-        Get the matching line from the content of the given file.
-        In case the matching number of lines are more than one or no
-        match found, an exception will be raised accordingly.
+        Get the index of the last matching line from the content of the given
+        file. The lines are scanned from the end, so the scan stops at the
+        first match. In case no match found, an exception will be raised.
 
         :param lines: Content of the given file
         :type lines: List[str]
 
         :raises: ``LookupError`` if no matching line can be found for match
 
-        :return: List of the matching line
-        :rtype: str
-        """
-
-        match = list(filter(self.match.match, lines))
-
-        if not match:
-            raise LookupError(f'No matching line for "{self.match}"')
-
-        return match.pop()
-
-    def __get_lines_from_file(self) -> Tuple[List[str], bool]:
-        """
-        Get the lines from the given file. In case of the file is empty, then
-        append the expected line.
-
-        :return: Returns the parsed lines and an indicator if the file was empty
-        :rtype: tuple
+        :return: Index of the matching line
+        :rtype: int
         """
 
-        file_was_empty = False
-
-        with self.param.open("r") as file:
-            logging.debug('Reading from "%s"', str(self.param))
-            lines: List[str] = file.read().splitlines()
-
-            if self.ensure_trailing_newline and lines[-1].strip() != "":
-                lines.append("")
-
-        if not lines:
-            logging.debug('Adding "%s" to "%s"', self.text, str(self.param))
-            lines.append(self.text)
-            file_was_empty = True
-
-        return lines, file_was_empty
+        match = self.match.match
+        prefix = self.match_prefix
 
-    def __write_content_to_file(self, lines: List[str]):
-        """
-        Write the extended content of the file back. When writing the lines it is
-        important to watch out for the new line character at the end of every line.
+        for index in range(len(lines) - 1, -1, -1):
+            line = lines[index]
 
-        :param lines: The new content of the original file
-        :type lines: List[str]
-        """
+            if line.startswith(prefix) and match(line):
+                return index
 
-        with self.param.open("w") as file:
-            file.writelines((f"{line}\n" for line in lines))
+        raise LookupError(f'No matching line for "{self.match}"')
 
-    def __add_line(self, lines: List[str]) -> None:
+    def __add_line(self, lines: List[str]) -> bool:
         """
         Make sure that the expected line is added to the list
-        of lines.
+        of lines. If the line is already at the expected position,
+        it is not added again.
 
         :param lines: Lines read from the input file
         :type lines: List[str]
+
+        :return: Returns True if the line was added
+        :rtype: bool
         """
 
-        match = self.__get_match(lines)
+        match_index = self.__get_match_index(lines)
+        insert_position = match_index + self.position
 
-        # Get the index of the element from the right
-        match_index = len(lines) - lines[::-1].index(match) - 1
+        text = self.text
 
-        insert_position = match_index + self.position
+        # Keep the original text untouched, otherwise the indentation would
+        # be added again whenever the rule is executed
+        if self.respect_indentation:
+            text = _get_indentation(lines[match_index], self.indentation_pattern) + text
 
-        logging.debug('Inserting "%s" to position "%d"', self.text, insert_position)
+        # The line inserted before the match moves the match by one line
+        existing_index = insert_position if self.position > 0 else insert_position - 1
 
-        indentation = self.indentation_pattern.match(lines[match_index])
-        if self.respect_indentation and indentation:
-            self.text = indentation.group() + self.text
+        if 0 <= existing_index < len(lines) and lines[existing_index] == text:
+            logging.debug('"%s" is already at position "%d"', text, existing_index)
+            return False
 
-        lines.insert(insert_position, self.text)
+        logging.debug('Inserting "%s" to position "%d"', self.text, insert_position)
+        lines.insert(insert_position, text)
 
-    def task(self) -> Path:
+        return True
+
+    def modify_lines(self, lines: List[str]) -> bool:
         """
-        Make sure that the given file contains the required line. This rule is
-        capable for inserting the expected rule before or after the unique match
-        text respecting the indentation of its context.
+        Make sure that the given lines contain the required line. In case
+        the file is empty, the line is added without looking for a match.
 
-        :raises: ``LookupError``
+        :param lines: Lines of the file
+        :type lines: List[str]
 
-        :return: Returns the path of the modified file
-        :rtype: Path
+        :raises: ``LookupError`` if no matching line can be found for match
+
+        :return: Returns True if the lines were modified
+        :rtype: bool
         """
 
-        lines, file_was_empty = self.__get_lines_from_file()
+        if not lines:
+            logging.debug('Adding "%s" to "%s"', self.text, self.param)
+            lines.append(self.text)
+            return True
 
-        if not file_was_empty:
-            self.__add_line(lines)
+        changed = False
 
-        self.__write_content_to_file(lines)
+        if self.ensure_trailing_newline and lines[-1].strip() != "":
+            lines.append("")
+            changed = True
 
-        return self.param
+        return self.__add_line(lines) or changed
 
 
-class LineNotExists(SinglePathRule):
+class LineNotExists(SingleTextFileRule):
     """
     Make sure that the given file not contains the specified line.
 
@@ -233,30 +396,40 @@ class LineNotExists(SinglePathRule):
         **kwargs,
     ) -> None:
         self.text = re.compile(self.validate(text, cast_to=str, required=True))
+        self.text_prefix = _get_literal_prefix(self.text)
 
         super().__init__(name, path, **kwargs)
 
-    def task(self) -> Path:
+    def modify_lines(self, lines: List[str]) -> bool:
         """
-        Make sure that the given file not contains the specified line.
+        Make sure that the given lines not contain the specified line.
 
-        :return: Returns the path of the modified file
-        :rtype: Path
+        :param lines: Lines of the file
+        :type lines: List[str]
+
+        :return: Returns True if the lines were modified
+        :rtype: bool
         """
 
-        with self.param.open("r") as file:
-            lines = file.read().splitlines()
+        match = self.text.match
+        prefix = self.text_prefix
 
-        new_lines = list(filter(lambda l: not self.text.match(l), lines))
+        # Lines not starting with the literal prefix of the pattern cannot
+        # match, so the pattern is matched only against the rest of the lines
+        new_lines = [
+            line for line in lines if not (line.startswith(prefix) and match(line))
+        ]
 
-        if new_lines != lines:
-            with self.param.open("w") as file:
-                file.writelines((f"{line}\n" for line in new_lines))
+        # Lines are only removed, so the file changed only if some lines are
+        # missing; there is no need to compare the lines one by one
+        if len(new_lines) == len(lines):
+            return False
 
-        return self.param
+        lines[:] = new_lines
+        return True
 
 
-class LineReplaced(SinglePathRule):
+class LineReplaced(SingleTextFileRule):
     """
     Make sure that the given text is replaced in the given file.
 
@@ -314,6 +487,10 @@ class LineReplaced(SinglePathRule):
         the rule used against production code.
     """
 
+    # Extracts the indentation of a line, override it in subclasses if a more
+    # complex pattern is required
+    indentation_pattern = INDENTATION_PATTERN
+
     def __init__(
         self,
         name: str,
@@ -325,83 +502,141 @@ class LineReplaced(SinglePathRule):
     ) -> None:
         self.text = self.validate(text, required=True)
         self.match = re.compile(self.validate(match, required=True))
+        self.match_prefix = _get_literal_prefix(self.match)
         self.respect_indentation = respect_indentation
 
-        self.indentation_pattern = re.compile(r"^\s+")
-
         super().__init__(name, path, **kwargs)
 
-    def __get_lines_from_file(self) -> Tuple[List[str], bool]:
+    def __replace_line(self, lines: List[str], match_index: int):
         """
-        Get the lines from the given file.
+        Replace the match texts with the given text.
+
+        :param lines: The new content of the original file
+        :type lines: List[str]
 
-        :return: Returns the parsed lines and an indicator if the file was empty
-        :rtype: tuple
+        :param match_index: Index of the matching line in the given file's content
+        :type match_index: int
         """
 
-        with self.param.open("r") as file:
-            logging.debug('Reading from "%s"', str(self.param))
-            lines = file.read().splitlines()
+        text = self.text
+
+        # Keep the original text untouched, otherwise the indentation would
+        # be added again for every matching line
+        if self.respect_indentation:
+            text = _get_indentation(lines[match_index], self.indentation_pattern) + text
 
-        return lines, not lines
+        lines[match_index] = text
 
-    def __write_content_to_file(self, lines: List[str]):
+    def modify_lines(self, lines: List[str]) -> bool:
         """
-        Write the extended content of the file back. When writing the lines it is
-        important to watch out for the new line character at the end of every line.
+        Make sure that the given text is replaced in the given lines.
 
-        :param lines: The new content of the original file
+        :param lines: Lines of the file
         :type lines: List[str]
+
+        :raises: ``LookupError`` if we can not decide or can not find what should be replaced
+        :return: Returns True if the lines were modified
+        :rtype: bool
         """
 
-        with self.param.open("w") as file:
-            file.writelines((f"{line}\n" for line in lines))
+        match = self.match.match
+        prefix = self.match_prefix
 
-    def __replace_line(self, lines: List[str], match: str):
-        """
-        Replace the match texts with the given text.
+        text = self.text
+        matches: List[int] = []
+        text_exists = False
 
-        :param lines: The new content of the original file
-        :type lines: List[str]
+        # Look for the matching lines and the text in a single pass
+        for index, line in enumerate(lines):
+            if line.startswith(prefix) and match(line):
+                matches.append(index)
 
-        :param match: The matching match in the given file's content
-        :type match: str
-        """
+            if not text_exists and line.strip() == text:
+                text_exists = True
 
-        match_index = lines.index(match)
+        if matches and text_exists:
+            raise LookupError(f'Both "{self.match}" and "{self.text}" exists')
 
-        indentation = self.indentation_pattern.match(lines[match_index])
-        if self.respect_indentation and indentation:
-            self.text = indentation.group() + self.text
+        if text_exists:
+            return False
 
-        lines[match_index] = self.text
+        if not matches:
+            raise LookupError(f'No matching line for "{self.match}"')
 
-    def task(self) -> Path:
-        """
-        Make sure that the given text is replaced in the given file.
+        for match_index in matches:
+            self.__replace_line(lines, match_index)
 
-        :raises: ``LookupError`` if we can not decide or can not find what should be replaced
-        :return: Returns the path of the modified file
-        :rtype: Path
-        """
+        return True
 
-        lines, _ = self.__get_lines_from_file()
 
-        matches = list(filter(self.match.match, lines))
-        text = list(filter(lambda l: l.strip() == self.text, lines))
+class LineBatch(SingleTextFileRule):
+    """
+    Apply multiple line modifications on a single text file. The file is read
+    only once, then all the operations are applied in the given order on the
+    lines, and finally the file is written back once, if any of the operations
+    modified the lines.
 
-        if matches and text:
-            raise LookupError(f'Both "{self.match}" and "{self.text}" exists')
+    Operations can be created from line rules by calling their ``as_operation``
+    class method with the same keyword arguments that the rule accepts, except
+    the ``path``.
 
-        if text:
-            return self.param
+    Example usage:
 
-        if not matches:
-            raise LookupError(f'No matching line for "{self.match}"')
+    .. code-block:: python
 
-        for match in matches:
-            self.__replace_line(lines, match)
+            >>> from pathlib import Path
+            >>> from hammurabi import Law, Pillar
+            >>> from hammurabi import LineBatch, LineExists, LineNotExists, LineReplaced
+            >>>
+            >>> example_law = Law(
+            >>>     name="Name of the law",
+            >>>     description="Well detailed description what this law does.",
+            >>>     rules=(
+            >>>         LineBatch(
+            >>>             name="Ensure gunicorn is configured",
+            >>>             path=Path("./gunicorn.conf.py"),
+            >>>             operations=(
+            >>>                 LineReplaced.as_operation(
+            >>>                     text="keepalive = 65", match=r"^kepalive.*"
+            >>>                 ),
+            >>>                 LineExists.as_operation(
+            >>>                     text="timeout = 30", match=r"^keepalive.*"
+            >>>                 ),
+            >>>                 LineNotExists.as_operation(text=r"^reload.*"),
+            >>>             ),
+            >>>         ),
+            >>>     )
+            >>> )
+            >>>
+            >>> pillar = Pillar()
+            >>> pillar.register(example_law)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[Path] = None,
+        operations: Iterable[Callable[[List[str]], bool]] = (),
+        **kwargs,
+    ) -> None:
+        self.operations = self.validate(operations, required=True)
+        super().__init__(name, path, **kwargs)
 
-        self.__write_content_to_file(lines)
+    def modify_lines(self, lines: List[str]) -> bool:
+        """
+        Apply all the operations on the given lines.
 
-        return self.param
+        :param lines: Lines of the file
+        :type lines: List[str]
+
+        :raises: ``LookupError`` raised by the operations
+        :return: Returns True if any of the operations modified the lines
+        :rtype: bool
+        """
+
+        modified = False
+
+        for operation in self.operations:
+            modified = operation(lines) or modified
+
+        return modified
@@ -12,11 +12,13 @@ already parsed file.
 """
 
 from abc import abstractmethod
+import logging
 from pathlib import Path
 from typing import Any, MutableMapping, Optional
 
 import toml
 
+from hammurabi.helpers import atomic_write
 from hammurabi.rules.dictionaries import (
     DictKeyExists,
     DictKeyNotExists,
@@ -26,6 +28,10 @@ from hammurabi.rules.dictionaries import (
     SinglePathDictParsedRule,
 )
 
+# The encoder keeps no state between dumps, unlike the decoder collecting
+# the comments of the parsed file, so a single instance is used for dumping
+COMMENT_PRESERVING_ENCODER = toml.TomlPreserveCommentEncoder()  # type: ignore
+
 
 class SingleDocumentTomlFileRule(SinglePathDictParsedRule):
     """
@@ -37,6 +43,7 @@ class SingleDocumentTomlFileRule(SinglePathDictParsedRule):
         self, name: str, path: Optional[Path] = None, key: str = "", **kwargs
     ) -> None:
         super().__init__(name, path, key, loader=self.__loader, **kwargs)
+        self.original_content = ""
 
     @staticmethod
     def __loader(toml_str: str) -> MutableMapping[str, Any]:
@@ -44,6 +51,16 @@ class SingleDocumentTomlFileRule(SinglePathDictParsedRule):
             toml_str, decoder=toml.TomlPreserveCommentDecoder()  # type: ignore
         )
 
+    def pre_task_hook(self) -> None:
+        """
+        Parse the file for later use and keep its original content to be
+        able to tell if the dumped content differs.
+        """
+
+        logging.debug('Parsing "%s" file', self.param)
+        self.original_content = self.param.read_text()
+        self.loaded_data = self.loader(self.original_content)
+
     def _write_dump(self, data: Any, delete: bool = False) -> None:
         """
         Helper function to write the dump into file.
@@ -58,13 +75,20 @@ class SingleDocumentTomlFileRule(SinglePathDictParsedRule):
         # TOML file cannot handle None as value, hence we need to set
         # something for that field if the user forgot to fill the value.
 
-        self.param.write_text(
-            toml.dumps(  # type: ignore
-                self.set_by_selector(self.loaded_data, self.split_key, data, delete),
-                encoder=toml.TomlPreserveCommentEncoder(),  # type: ignore
-            )
+        content = toml.dumps(  # type: ignore
+            self.set_by_selector(self.loaded_data, self.split_key, data, delete),
+            encoder=COMMENT_PRESERVING_ENCODER,
         )
 
+        # Writing the same content again would only touch the file
+        if content == self.original_content:
+            return
+
+        with atomic_write(self.param) as file:
+            file.write(content)
+
+        self.original_content = content
+
     @abstractmethod
     def task(self) -> Path:
         """
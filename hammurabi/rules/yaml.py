@@ -6,11 +6,20 @@ already parsed file.
 """
 
 from abc import abstractmethod
+from io import StringIO
+import logging
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Optional, Tuple
 
 from ruamel.yaml import YAML
 
+from hammurabi.helpers import (
+    FileSignature,
+    ParsedFileCache,
+    atomic_write,
+    get_file_signature,
+)
+from hammurabi.rules.common import SinglePathRule
 from hammurabi.rules.dictionaries import (
     DictKeyExists,
     DictKeyNotExists,
@@ -20,6 +29,140 @@ from hammurabi.rules.dictionaries import (
     SinglePathDictParsedRule,
 )
 
+# Documents written by the rules, reused by the next rule of the file. The
+# documents are stored together with the mode they were parsed in, since a
+# document parsed in safe mode has no formatting to keep in round-trip mode,
+# and with the content of the file they were written as
+PARSED_DOCUMENTS = ParsedFileCache()
+
+# Content of a Yaml file read ahead of the execution, prefixed by the
+# signature of the file at the time of read.
+PrefetchedYaml = Tuple[FileSignature, str]
+
+
+def read_yaml_file(path: Path) -> Optional[PrefetchedYaml]:
+    """
+    Read the Yaml file ahead of the execution of the rules. The read content
+    can be passed to the rules by their ``prefetch`` method.
+
+    :param path: Path of the Yaml file
+    :type path: Path
+
+    :return: Returns the signature and content of the file or None if the
+        file cannot be read
+    :rtype: Optional[PrefetchedYaml]
+    """
+
+    try:
+        return get_file_signature(path), path.read_text()
+    except OSError:
+        return None
+
+
+def _create_yaml(preserve_formatting: bool) -> YAML:
+    """
+    Create the Yaml parser and dumper.
+
+    :param preserve_formatting: Indicate if the comments and formatting of
+        the file should be kept by parsing it in round-trip mode
+    :type preserve_formatting: bool
+
+    :return: Returns the Yaml parser and dumper
+    :rtype: YAML
+    """
+
+    yaml = YAML() if preserve_formatting else YAML(typ="safe", pure=False)
+    yaml.default_flow_style = False
+
+    return yaml
+
+
+def _load_document(
+    path: Path,
+    yaml: YAML,
+    preserve_formatting: bool,
+    prefetched: Optional[PrefetchedYaml] = None,
+) -> Tuple[Any, str]:
+    """
+    Load the Yaml document of the file, or reuse the document left behind by
+    the previous rule targeting the file. In case the file was read ahead
+    and it was not modified since then, the read content is parsed.
+
+    :param path: Path of the Yaml file
+    :type path: Path
+
+    :param yaml: The Yaml parser
+    :type yaml: YAML
+
+    :param preserve_formatting: Indicate if the parser keeps the formatting
+    :type preserve_formatting: bool
+
+    :param prefetched: The signature and content of the file read ahead
+    :type prefetched: Optional[PrefetchedYaml]
+
+    :return: Returns the parsed document and the content of the file
+    :rtype: Tuple[Any, str]
+    """
+
+    entry = PARSED_DOCUMENTS.take(path)
+
+    if entry is not None and entry[0] == preserve_formatting:
+        logging.debug('Using parsed document of "%s"', path)
+        return entry[1], entry[2]
+
+    if prefetched is not None and prefetched[0] == get_file_signature(path):
+        logging.debug('Parsing prefetched content of "%s"', path)
+        content = prefetched[1]
+    else:
+        logging.debug('Parsing "%s" file', path)
+        content = path.read_text()
+
+    return yaml.load(content), content
+
+
+def _dump_document(
+    path: Path, yaml: YAML, preserve_formatting: bool, data: Any, original: str
+) -> str:
+    """
+    Write the Yaml document into the file and keep it for the next rule. In
+    case the serialized document equals the original content of the file,
+    the write is skipped.
+
+    :param path: Path of the Yaml file
+    :type path: Path
+
+    :param yaml: The Yaml dumper
+    :type yaml: YAML
+
+    :param preserve_formatting: Indicate if the document keeps the formatting
+    :type preserve_formatting: bool
+
+    :param data: The document to write
+    :type data: Any
+
+    :param original: The content of the file the document was loaded from
+    :type original: str
+
+    :return: Returns the content of the file
+    :rtype: str
+    """
+
+    # Serialize the whole document first, so the emitter's many small writes
+    # do not go through the file and it is written with a single call
+    buffer = StringIO()
+    yaml.dump(data, buffer)
+    content = buffer.getvalue()
+
+    # Writing the same content again would only touch the file
+    if content != original:
+        with atomic_write(path) as file:
+            file.write(content)
+    else:
+        logging.debug('No changes made on "%s", skipping write', path)
+
+    PARSED_DOCUMENTS.put(path, (preserve_formatting, data, content))
+    return content
+
 
 class SingleDocumentYamlFileRule(SinglePathDictParsedRule):
     """
@@ -29,16 +172,86 @@ class SingleDocumentYamlFileRule(SinglePathDictParsedRule):
     .. warning::
 
         This rule requires the ``yaml`` extra to be installed.
+
+    .. note::
+
+        The file is parsed in round-trip mode to keep its comments and
+        formatting. If that is not needed, set ``preserve_formatting`` to
+        False in a subclass to parse and dump the file by the much faster
+        libyaml based safe mode.
     """
 
+    # Parse the file in round-trip mode, which keeps the comments and the
+    # formatting of the file but is implemented in pure Python
+    preserve_formatting = True
+
     def __init__(
         self, name: str, path: Optional[Path] = None, key: str = "", **kwargs
     ) -> None:
-        self.yaml = YAML()
-        self.yaml.default_flow_style = False
+        self.yaml = _create_yaml(self.preserve_formatting)
+
+        # Set when the rule is used as an operation of a batch, so the
+        # batch is responsible for writing the document.
+        self._deferred_write = False
+        self._dirty = False
+
+        self._prefetched: Optional[PrefetchedYaml] = None
+        self.original_content = ""
 
         super().__init__(name, path, key, loader=self.yaml.load, **kwargs)
 
+    @classmethod
+    def as_operation(cls, **kwargs) -> Callable[[Any], bool]:
+        """
+        Create an operation from the rule which can be applied on an already
+        parsed document by :class:`hammurabi.rules.yaml.YamlBatch`. The
+        keyword arguments are passed to the rule, except the ``path`` which
+        is given by the batch. If no ``name`` is given, the name of the rule
+        class is used.
+
+        The returned operation accepts the parsed document and returns
+        True if it modified the document.
+
+        :return: Returns the operation representing the rule
+        :rtype: Callable[[Any], bool]
+        """
+
+        kwargs.setdefault("name", cls.__name__)
+        rule = cls(**kwargs)
+        rule._deferred_write = True  # pylint: disable=protected-access
+
+        def operation(loaded_data: Any) -> bool:
+            rule.loaded_data = loaded_data
+            rule._dirty = False  # pylint: disable=protected-access
+            rule.task()
+            return rule._dirty  # pylint: disable=protected-access
+
+        return operation
+
+    def pre_task_hook(self) -> None:
+        """
+        Parse the file for later use. In case the previous rule targeting the
+        file left its parsed document behind, that is used instead of parsing
+        the file again.
+        """
+
+        prefetched, self._prefetched = self._prefetched, None
+        self.loaded_data, self.original_content = _load_document(
+            self.param, self.yaml, self.preserve_formatting, prefetched
+        )
+
+    def prefetch(self, prefetched: Optional[PrefetchedYaml]) -> None:
+        """
+        Set the content of the Yaml file read ahead of the execution by
+        :func:`hammurabi.rules.yaml.read_yaml_file`. The content is used
+        only if the file was not modified since it was read.
+
+        :param prefetched: The signature and content of the file
+        :type prefetched: Optional[PrefetchedYaml]
+        """
+
+        self._prefetched = prefetched
+
     def _write_dump(self, data: Any, delete: bool = False) -> None:
         """
         Helper function to write the dump into file.
@@ -52,9 +265,20 @@ class SingleDocumentYamlFileRule(SinglePathDictParsedRule):
 
         self.param: Path
 
-        self.yaml.dump(
-            self.set_by_selector(self.loaded_data, self.split_key, data, delete),
+        updated_data = self.set_by_selector(
+            self.loaded_data, self.split_key, data, delete
+        )
+
+        if self._deferred_write:
+            self._dirty = True
+            return
+
+        self.original_content = _dump_document(
             self.param,
+            self.yaml,
+            self.preserve_formatting,
+            updated_data,
+            self.original_content,
         )
 
     @abstractmethod
@@ -295,3 +519,116 @@ class YamlValueNotExists(DictValueNotExists, SingleDocumentYamlFileRule):
 
         This rule requires the ``yaml`` extra to be installed.
     """
+
+
+class YamlBatch(SinglePathRule):
+    """
+    Apply multiple Yaml file modifications on a single file. The file is parsed
+    only once, then all the operations are applied in the given order on the
+    parsed document, and finally the document is written back once, if any
+    of the operations modified it.
+
+    Operations can be created from Yaml rules by calling their ``as_operation``
+    class method with the same keyword arguments that the rule accepts, except
+    the ``path``.
+
+    Example usage:
+
+        >>> from pathlib import Path
+        >>> from hammurabi import Law, Pillar
+        >>> from hammurabi import YamlBatch, YamlKeyExists, YamlKeyNotExists
+        >>>
+        >>> example_law = Law(
+        >>>     name="Name of the law",
+        >>>     description="Well detailed description what this law does.",
+        >>>     rules=(
+        >>>         YamlBatch(
+        >>>             name="Ensure service descriptor is up to date",
+        >>>             path=Path("./service.yaml"),
+        >>>             operations=(
+        >>>                 YamlKeyExists.as_operation(key="stack", value="python"),
+        >>>                 YamlKeyNotExists.as_operation(key="outdated_key"),
+        >>>             ),
+        >>>         ),
+        >>>     )
+        >>> )
+        >>>
+        >>> pillar = Pillar()
+        >>> pillar.register(example_law)
+
+    .. warning::
+
+        This rule requires the ``yaml`` extra to be installed.
+    """
+
+    # Parse the file in round-trip mode, which keeps the comments and the
+    # formatting of the file but is implemented in pure Python
+    preserve_formatting = True
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[Path] = None,
+        operations: Iterable[Callable[[Any], bool]] = (),
+        **kwargs,
+    ) -> None:
+        self.operations = self.validate(operations, required=True)
+        self.yaml = _create_yaml(self.preserve_formatting)
+        self.loaded_data: Any = None
+        self._prefetched: Optional[PrefetchedYaml] = None
+        self.original_content = ""
+
+        super().__init__(name, path, **kwargs)
+
+    def pre_task_hook(self) -> None:
+        """
+        Parse the file for later use.
+        """
+
+        prefetched, self._prefetched = self._prefetched, None
+        self.loaded_data, self.original_content = _load_document(
+            self.param, self.yaml, self.preserve_formatting, prefetched
+        )
+
+        # Operations modify the document in place, so an empty file must be
+        # represented by a document which can hold the keys
+        if self.loaded_data is None:
+            self.loaded_data = dict()
+
+    def prefetch(self, prefetched: Optional[PrefetchedYaml]) -> None:
+        """
+        Set the content of the Yaml file read ahead of the execution by
+        :func:`hammurabi.rules.yaml.read_yaml_file`. The content is used
+        only if the file was not modified since it was read.
+
+        :param prefetched: The signature and content of the file
+        :type prefetched: Optional[PrefetchedYaml]
+        """
+
+        self._prefetched = prefetched
+
+    def task(self) -> Path:
+        """
+        Apply all the operations on the parsed document and write the
+        document back if any of the operations modified it.
+
+        :raises: ``LookupError`` raised by the operations
+        :return: Return the input path as an output
+        :rtype: Path
+        """
+
+        modified = False
+
+        for operation in self.operations:
+            modified = operation(self.loaded_data) or modified
+
+        if modified:
+            self.original_content = _dump_document(
+                self.param,
+                self.yaml,
+                self.preserve_formatting,
+                self.loaded_data,
+                self.original_content,
+            )
+
+        return self.param
@@ -1,10 +1,21 @@
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from hammurabi.rules.ini import SectionExists, SectionNotExists, SectionRenamed
-from tests.fixtures import temporary_file
-
+from hammurabi.rules.ini import (
+    IniBatch,
+    OptionRenamed,
+    OptionsExist,
+    OptionsNotExist,
+    SectionExists,
+    SectionNotExists,
+    SectionRenamed,
+    read_config_file,
+)
+from tests.fixtures import temporary_dir, temporary_file
+
+assert temporary_dir
 assert temporary_file
 
 
@@ -173,13 +184,37 @@ def test_section_not_exists_no_section_match(temporary_file):
         section="remove_me_if_you_can",
     )
 
-    rule.pre_task_hook()
+    with patch.object(rule.updater, "read_string") as mocked_read:
+        rule.pre_task_hook()
+
     rule.task()
 
+    assert mocked_read.called is False
     assert expected_file.read_text() == "[main]"
     expected_file.unlink()
 
 
+@pytest.mark.integration
+def test_section_not_exists_rerun_no_section_match(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\n[remains]")
+
+    rule = SectionNotExists(
+        name="Ensure section not exists", path=expected_file, section="main"
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    expected_file.write_text("[other]\n")
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == "[other]\n"
+    expected_file.unlink()
+
+
 @pytest.mark.integration
 def test_section_renamed(temporary_file):
     expected_file = Path(temporary_file.name)
@@ -197,3 +232,404 @@ def test_section_renamed(temporary_file):
 
     assert expected_file.read_text() == "[new_name]\n"
     expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_options_not_exist(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nremove = me\nkeep = me\n")
+
+    rule = OptionsNotExist(
+        name="Ensure options not exist",
+        path=expected_file,
+        section="main",
+        options=("remove",),
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == "[main]\nkeep = me\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_options_not_exist_no_section_match(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nremove = me\n")
+
+    rule = OptionsNotExist(
+        name="Ensure options not exist",
+        path=expected_file,
+        section="missing",
+        options=("remove",),
+    )
+
+    with patch.object(rule.updater, "read_string") as mocked_read:
+        rule.pre_task_hook()
+
+    with pytest.raises(LookupError):
+        rule.task()
+
+    assert mocked_read.called is False
+    assert expected_file.read_text() == "[main]\nremove = me\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_options_not_exist_rerun_no_section_match(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nremove = me\nkeep = me\n")
+
+    rule = OptionsNotExist(
+        name="Ensure options not exist",
+        path=expected_file,
+        section="main",
+        options=("remove",),
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    expected_file.write_text("[other]\nremove = me\n")
+
+    rule.pre_task_hook()
+
+    with pytest.raises(LookupError):
+        rule.task()
+
+    assert expected_file.read_text() == "[other]\nremove = me\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_ini_batch(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nremove = me\n")
+
+    rule = IniBatch(
+        name="Ensure ini file is configured",
+        path=expected_file,
+        operations=(
+            SectionExists.as_operation(section="polling", match="main"),
+            OptionsExist.as_operation(section="polling", options=(("interval", "2s"),)),
+            OptionsNotExist.as_operation(section="main", options=("remove",)),
+        ),
+    )
+
+    with patch.object(rule.updater, "write", wraps=rule.updater.write) as mocked_write:
+        rule.pre_task_hook()
+        rule.task()
+
+    mocked_write.assert_called_once()
+    assert expected_file.read_text() == "[main]\n\n[polling]\ninterval = 2s\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_ini_batch_no_changes(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\n")
+
+    rule = IniBatch(
+        name="Ensure ini file is configured",
+        path=expected_file,
+        operations=(SectionNotExists.as_operation(section="missing"),),
+    )
+
+    with patch.object(rule.updater, "write") as mocked_write:
+        rule.pre_task_hook()
+        rule.task()
+
+    assert mocked_write.called is False
+    assert expected_file.read_text() == "[main]\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_ini_batch_parsed_config_reused(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\n")
+
+    first_rule = SectionExists(
+        name="Ensure section exists", path=expected_file, section="polling"
+    )
+
+    batch = IniBatch(
+        name="Ensure ini file is configured",
+        path=expected_file,
+        operations=(
+            OptionsExist.as_operation(section="polling", options=(("interval", "2s"),)),
+        ),
+    )
+
+    last_rule = OptionsExist(
+        name="Ensure options exist",
+        path=expected_file,
+        section="main",
+        options=(("debug", "false"),),
+    )
+
+    first_rule.pre_task_hook()
+    first_rule.task()
+
+    with patch.object(batch.updater, "read_string") as mocked_read:
+        batch.pre_task_hook()
+
+    batch.task()
+    mocked_read.assert_not_called()
+
+    with patch.object(last_rule.updater, "read_string") as mocked_read:
+        last_rule.pre_task_hook()
+
+    last_rule.task()
+    mocked_read.assert_not_called()
+
+    assert (
+        expected_file.read_text()
+        == "[main]\ndebug = false\n\n[polling]\ninterval = 2s\n"
+    )
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_ini_batch_prefetched_content(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\n")
+
+    rule = IniBatch(
+        name="Ensure ini file is configured",
+        path=expected_file,
+        operations=(SectionNotExists.as_operation(section="main"),),
+    )
+    rule.prefetch(read_config_file(expected_file))
+
+    with patch.object(Path, "read_text") as mocked_read_text:
+        rule.pre_task_hook()
+
+    mocked_read_text.assert_not_called()
+
+    rule.task()
+
+    assert expected_file.read_text() == ""
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_option_renamed(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nTypo = value\n")
+
+    rule = OptionRenamed(
+        name="Ensure option renamed",
+        path=expected_file,
+        section="main",
+        option="typo",
+        new_name="correct",
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == "[main]\ncorrect = value\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_option_renamed_already_renamed(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\ncorrect = value\n")
+
+    rule = OptionRenamed(
+        name="Ensure option renamed",
+        path=expected_file,
+        section="main",
+        option="typo",
+        new_name="correct",
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == "[main]\ncorrect = value\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_prefetched_content(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\n")
+
+    rule = SectionExists(
+        name="Ensure section exists", path=expected_file, section="main"
+    )
+
+    rule.prefetch(read_config_file(expected_file))
+
+    with patch.object(Path, "read_text") as mocked_read:
+        rule.pre_task_hook()
+
+    assert mocked_read.called is False
+    assert rule.updater.sections() == ["main"]
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_options_exist(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nkeep = me\n")
+
+    rule = OptionsExist(
+        name="Ensure options exist",
+        path=expected_file,
+        section="main",
+        options=(("Keep", "changed"), ("new", "value")),
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == "[main]\nkeep = me\nnew = value\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_options_exist_symlink(temporary_dir):
+    target_file = Path(temporary_dir, "shared", "setup.cfg")
+    target_file.parent.mkdir()
+    target_file.write_text("[main]\nkeep = me\n")
+
+    expected_file = Path(temporary_dir, "setup.cfg")
+    expected_file.symlink_to(target_file)
+
+    rule = OptionsExist(
+        name="Ensure options exist",
+        path=expected_file,
+        section="main",
+        options=(("new", "value"),),
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.is_symlink()
+    assert target_file.read_text() == "[main]\nkeep = me\nnew = value\n"
+
+
+@pytest.mark.integration
+def test_options_exist_force_value(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nkeep = me\n")
+
+    rule = OptionsExist(
+        name="Ensure options exist",
+        path=expected_file,
+        section="main",
+        options=(("keep", "changed"),),
+        force_value=True,
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == "[main]\nkeep = changed\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_options_exist_force_value_unchanged(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nkeep = me\n")
+
+    rule = OptionsExist(
+        name="Ensure options exist",
+        path=expected_file,
+        section="main",
+        options=(("keep", "me"),),
+        force_value=True,
+    )
+
+    with patch("hammurabi.rules.ini.atomic_write") as mocked_write:
+        rule.pre_task_hook()
+        rule.task()
+
+    mocked_write.assert_not_called()
+    assert expected_file.read_text() == "[main]\nkeep = me\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_section_exists_update_options(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\nOption_1 = old\n")
+
+    rule = SectionExists(
+        name="Ensure section exists",
+        path=expected_file,
+        section="main",
+        options=(("option_1", "new"), ("Option_2", True), ("option_3", "value")),
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert (
+        expected_file.read_text()
+        == "[main]\nOption_1 = new\nOption_2 = True\noption_3 = value\n"
+    )
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_section_exists_missing_file(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.unlink()
+
+    rule = SectionExists(
+        name="Ensure section exists",
+        path=expected_file,
+        section="test_section",
+        options=(("option_1", "some value"),),
+    )
+
+    with patch.object(rule.updater, "read_string") as mocked_read:
+        rule.pre_task_hook()
+
+    rule.task()
+
+    assert mocked_read.called is False
+    assert expected_file.read_text() == "[test_section]\noption_1 = some value\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_parsed_config_reused(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\n")
+
+    first_rule = OptionsExist(
+        name="Ensure options exist",
+        path=expected_file,
+        section="main",
+        options=(("first", "value"),),
+    )
+
+    second_rule = OptionsExist(
+        name="Ensure options exist",
+        path=expected_file,
+        section="main",
+        options=(("second", "value"),),
+    )
+
+    first_rule.pre_task_hook()
+    first_rule.task()
+
+    with patch.object(second_rule.updater, "read_string") as mocked_read:
+        second_rule.pre_task_hook()
+
+    second_rule.task()
+
+    assert mocked_read.called is False
+    assert second_rule.updater is first_rule.updater
+    assert expected_file.read_text() == "[main]\nfirst = value\nsecond = value\n"
+    expected_file.unlink()
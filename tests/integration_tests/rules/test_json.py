@@ -1,17 +1,22 @@
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from hammurabi.helpers import atomic_write
 from hammurabi.rules.json import (
+    JsonBatch,
     JsonKeyExists,
     JsonKeyNotExists,
     JsonKeyRenamed,
     JsonValueExists,
     JsonValueNotExists,
 )
-from tests.fixtures import temporary_file
+from tests.fixtures import temporary_dir, temporary_file, temporary_file_generator
 
+assert temporary_dir
 assert temporary_file
+assert temporary_file_generator
 
 
 @pytest.mark.integration
@@ -661,3 +666,230 @@ def test_value_not_exists_dict_no_key(temporary_file):
         == '{"stack":"python","dependencies":{"service3":true}}'
     )
     expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_parsed_document_reused(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("{}")
+
+    first_rule = JsonKeyExists(name="Ensure key exists", path=expected_file, key="a")
+    second_rule = JsonKeyExists(name="Ensure key exists", path=expected_file, key="b")
+
+    first_rule.pre_task_hook()
+    first_rule.task()
+
+    with patch.object(second_rule, "loader") as mocked_loader:
+        second_rule.pre_task_hook()
+
+    second_rule.task()
+
+    assert mocked_loader.called is False
+    assert expected_file.read_text() == '{"a":null,"b":null}'
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_key_exists_selector_dots(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("{}")
+
+    rule = JsonKeyExists(
+        name="Ensure key exists", path=expected_file, key=".development.supported."
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == '{"development":{"supported":null}}'
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_value_exists_already_set(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text('{"stack": "python", "dependencies": ["service1"]}')
+
+    rules = (
+        JsonValueExists(
+            name="Ensure value exists",
+            path=expected_file,
+            key="stack",
+            value="python",
+        ),
+        JsonValueExists(
+            name="Ensure value exists",
+            path=expected_file,
+            key="dependencies",
+            value=["service1"],
+        ),
+        JsonValueExists(
+            name="Ensure value exists",
+            path=expected_file,
+            key="dependencies",
+            value="service1",
+        ),
+    )
+
+    for rule in rules:
+        rule.pre_task_hook()
+        rule.task()
+
+    # The file is not written back, so its formatting is untouched
+    assert (
+        expected_file.read_text() == '{"stack": "python", "dependencies": ["service1"]}'
+    )
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_value_exists_dict_already_set(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text('{"dependencies": {"service1": true}}')
+
+    rule = JsonValueExists(
+        name="Ensure value exists",
+        path=expected_file,
+        key="dependencies",
+        value={"service1": True},
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == '{"dependencies": {"service1": true}}'
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_key_exists_not_written_if_exists(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text('{"stack": "python"}')
+
+    rule = JsonKeyExists(
+        name="Ensure key exists", path=expected_file, key="stack", value="scala"
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == '{"stack": "python"}'
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_json_batch(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text('{"stack": "scala", "outdated": true}')
+
+    rule = JsonBatch(
+        name="Ensure service descriptor is up to date",
+        path=expected_file,
+        operations=(
+            JsonValueExists.as_operation(key="stack", value="python"),
+            JsonKeyExists.as_operation(key="development.supported", value=True),
+            JsonKeyNotExists.as_operation(key="outdated"),
+        ),
+    )
+
+    with patch("hammurabi.rules.json.atomic_write", wraps=atomic_write) as mocked:
+        rule.pre_task_hook()
+        rule.task()
+
+    mocked.assert_called_once()
+    assert (
+        expected_file.read_text()
+        == '{"stack":"python","development":{"supported":true}}'
+    )
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_json_batch_no_changes(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text('{"stack": "python"}')
+
+    rule = JsonBatch(
+        name="Ensure service descriptor is up to date",
+        path=expected_file,
+        operations=(
+            JsonKeyExists.as_operation(key="stack", value="python"),
+            JsonKeyNotExists.as_operation(key="outdated"),
+        ),
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == '{"stack": "python"}'
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_shared_value_not_modified(temporary_file_generator):
+    first_file = Path(temporary_file_generator(".json").name)
+    second_file = Path(temporary_file_generator(".json").name)
+    first_file.write_text("{}")
+    second_file.write_text("{}")
+
+    default_tags = ["base"]
+
+    rules = (
+        JsonKeyExists(
+            name="First tags", path=first_file, key="tags", value=default_tags
+        ),
+        JsonValueExists(
+            name="First only tag", path=first_file, key="tags", value="only-for-first"
+        ),
+        JsonKeyExists(
+            name="Second tags", path=second_file, key="tags", value=default_tags
+        ),
+    )
+
+    for rule in rules:
+        rule.pre_task_hook()
+        rule.task()
+
+    assert default_tags == ["base"]
+    assert first_file.read_text() == '{"tags":["base","only-for-first"]}'
+    assert second_file.read_text() == '{"tags":["base"]}'
+    first_file.unlink()
+    second_file.unlink()
+
+
+@pytest.mark.integration
+def test_key_exists_symlink(temporary_dir):
+    target_file = Path(temporary_dir, "shared", "package.json")
+    target_file.parent.mkdir()
+    target_file.write_text("{}")
+
+    expected_file = Path(temporary_dir, "package.json")
+    expected_file.symlink_to(target_file)
+
+    rule = JsonKeyExists(
+        name="Ensure key exists", path=expected_file, key="stack", value="python"
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.is_symlink()
+    assert target_file.read_text() == '{"stack":"python"}'
+
+
+@pytest.mark.integration
+def test_large_integer_kept(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text('{"id": 123456789012345678901234567890, "x": {}}')
+
+    rule = JsonKeyExists(
+        name="Ensure key exists", path=expected_file, key="x.y", value=1
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert (
+        expected_file.read_text() == '{"id":123456789012345678901234567890,"x":{"y":1}}'
+    )
+    expected_file.unlink()
@@ -1,8 +1,9 @@
 from pathlib import Path
 
+from jinja2 import UndefinedError
 import pytest
 
-from hammurabi.rules.templates import TemplateRendered
+from hammurabi.rules.templates import TemplateRendered, get_template
 from tests.fixtures import temporary_file_generator
 
 assert temporary_file_generator
@@ -48,3 +49,54 @@ def test_destination_overwrite(temporary_file_generator):
 
     assert destination_path.read_text() == "Hello World!"
     destination_path.unlink()
+
+
+@pytest.mark.integration
+def test_compiled_template_reused(temporary_file_generator):
+    template_path = Path(temporary_file_generator().name)
+    template_path.write_text("Hello {{ magic_word }}!")
+
+    assert get_template(template_path) is get_template(template_path)
+
+
+@pytest.mark.integration
+def test_modified_template_recompiled(temporary_file_generator):
+    template_path = Path(temporary_file_generator().name)
+    template_path.write_text("Hello {{ magic_word }}!")
+
+    destination_path = Path(temporary_file_generator().name)
+
+    rule = TemplateRendered(
+        name="Template rendered",
+        template=template_path,
+        destination=destination_path,
+        context={"magic_word": "World"},
+    )
+
+    rule.task()
+    template_path.write_text("Goodbye {{ magic_word }}!")
+    rule.task()
+
+    assert destination_path.read_text() == "Goodbye World!"
+    destination_path.unlink()
+
+
+@pytest.mark.integration
+def test_destination_kept_on_render_error(temporary_file_generator):
+    template_path = Path(temporary_file_generator().name)
+    template_path.write_text("Hello {{ magic_word.missing.attribute }}!")
+
+    destination_path = Path(temporary_file_generator().name)
+    destination_path.write_text("Here comes the greeting")
+
+    rule = TemplateRendered(
+        name="Template rendered",
+        template=template_path,
+        destination=destination_path,
+    )
+
+    with pytest.raises(UndefinedError):
+        rule.task()
+
+    assert destination_path.read_text() == "Here comes the greeting"
+    destination_path.unlink()
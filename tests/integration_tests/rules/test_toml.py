@@ -1,4 +1,5 @@
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 import toml
@@ -69,7 +70,7 @@ def test_key_nested_already_exists(temporary_file):
 
     assert (
         expected_file.read_text()
-        == 'apple = "banana"\n\n[dict]\nvalue = "exists"\n\n[dict.development]\nsupported = true\n'
+        == 'apple = "banana"\n[dict]\nvalue = "exists"\n[dict.development]\nsupported = true'
     )
     expected_file.unlink()
 
@@ -672,3 +673,22 @@ def test_value_not_exists_dict_no_key(temporary_file):
         == 'stack = "python"\n\n[dependencies]\nservice3 = true'
     )
     expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_same_content_not_written(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text('[dict]\nvalue = "exists"\n')
+
+    rule = TomlValueExists(
+        name="Ensure value exists", path=expected_file, key="dict.value", value="x"
+    )
+
+    rule.pre_task_hook()
+
+    with patch("hammurabi.rules.toml.atomic_write") as mocked_write:
+        rule._write_dump("exists")
+
+    assert mocked_write.called is False
+    assert expected_file.read_text() == '[dict]\nvalue = "exists"\n'
+    expected_file.unlink()
@@ -1,17 +1,21 @@
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from hammurabi.helpers import atomic_write
 from hammurabi.rules.yaml import (
+    YamlBatch,
     YamlKeyExists,
     YamlKeyNotExists,
     YamlKeyRenamed,
     YamlValueExists,
     YamlValueNotExists,
 )
-from tests.fixtures import temporary_file
+from tests.fixtures import temporary_file, temporary_file_generator
 
 assert temporary_file
+assert temporary_file_generator
 
 
 @pytest.mark.integration
@@ -669,3 +673,230 @@ def test_value_not_exists_dict_no_key(temporary_file):
 
     assert expected_file.read_text() == "stack: python\ndependencies: {service3: true}"
     expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_key_exists_without_preserving_formatting(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("# comment\nmain:\n  value: 1\n")
+
+    class FastYamlKeyExists(YamlKeyExists):
+        preserve_formatting = False
+
+    rule = FastYamlKeyExists(
+        name="Ensure key exists", path=expected_file, key="main.stack", value="python"
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == "main:\n  stack: python\n  value: 1\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_parsed_document_reused(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("# comment\nmain:\n  value: 1\n")
+
+    first_rule = YamlKeyExists(
+        name="Ensure key exists", path=expected_file, key="main.first", value=1
+    )
+
+    second_rule = YamlKeyExists(
+        name="Ensure key exists", path=expected_file, key="main.second", value=2
+    )
+
+    first_rule.pre_task_hook()
+    first_rule.task()
+
+    with patch.object(second_rule, "loader") as mocked_loader:
+        second_rule.pre_task_hook()
+
+    second_rule.task()
+
+    assert mocked_loader.called is False
+    assert (
+        expected_file.read_text()
+        == "# comment\nmain:\n  value: 1\n  first: 1\n  second: 2\n"
+    )
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_modified_document_parsed_again(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("main:\n  value: 1\n")
+
+    first_rule = YamlKeyExists(
+        name="Ensure key exists", path=expected_file, key="main.first", value=1
+    )
+
+    second_rule = YamlKeyExists(
+        name="Ensure key exists", path=expected_file, key="main.second", value=2
+    )
+
+    first_rule.pre_task_hook()
+    first_rule.task()
+
+    expected_file.write_text("other:\n  value: 1\n")
+
+    second_rule.pre_task_hook()
+    second_rule.task()
+
+    assert expected_file.read_text() == "other:\n  value: 1\nmain:\n  second: 2\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_yaml_batch(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("# Service\nstack: scala\noutdated: true\n")
+
+    rule = YamlBatch(
+        name="Ensure service descriptor is up to date",
+        path=expected_file,
+        operations=(
+            YamlValueExists.as_operation(key="stack", value="python"),
+            YamlKeyExists.as_operation(key="development.supported", value=True),
+            YamlKeyNotExists.as_operation(key="outdated"),
+        ),
+    )
+
+    with patch("hammurabi.rules.yaml.atomic_write", wraps=atomic_write) as mocked:
+        rule.pre_task_hook()
+        rule.task()
+
+    mocked.assert_called_once()
+    assert (
+        expected_file.read_text()
+        == "# Service\nstack: python\ndevelopment:\n  supported: true\n"
+    )
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_yaml_batch_no_changes(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("stack: python\n")
+
+    rule = YamlBatch(
+        name="Ensure service descriptor is up to date",
+        path=expected_file,
+        operations=(
+            YamlKeyExists.as_operation(key="stack", value="python"),
+            YamlKeyNotExists.as_operation(key="outdated"),
+        ),
+    )
+
+    with patch("hammurabi.rules.yaml.atomic_write", wraps=atomic_write) as mocked:
+        rule.pre_task_hook()
+        rule.task()
+
+    mocked.assert_not_called()
+    assert expected_file.read_text() == "stack: python\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_yaml_batch_empty_file(temporary_file):
+    expected_file = Path(temporary_file.name)
+
+    rule = YamlBatch(
+        name="Ensure service descriptor is up to date",
+        path=expected_file,
+        operations=(YamlKeyExists.as_operation(key="stack", value="python"),),
+    )
+
+    rule.pre_task_hook()
+    rule.task()
+
+    assert expected_file.read_text() == "stack: python\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_yaml_batch_same_content_not_written(temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("# Service\nstack: python\n")
+
+    rule = YamlBatch(
+        name="Ensure service descriptor is up to date",
+        path=expected_file,
+        operations=(
+            YamlKeyExists.as_operation(key="temporary", value=True),
+            YamlKeyNotExists.as_operation(key="temporary"),
+        ),
+    )
+
+    with patch("hammurabi.rules.yaml.atomic_write", wraps=atomic_write) as mocked:
+        rule.pre_task_hook()
+        rule.task()
+
+    mocked.assert_not_called()
+    assert expected_file.read_text() == "# Service\nstack: python\n"
+    expected_file.unlink()
+
+
+@pytest.mark.integration
+def test_shared_value_not_modified(temporary_file_generator):
+    first_file = Path(temporary_file_generator(".yaml").name)
+    second_file = Path(temporary_file_generator(".yaml").name)
+
+    default_tags = ["base"]
+
+    rules = (
+        YamlKeyExists(
+            name="First tags", path=first_file, key="tags", value=default_tags
+        ),
+        YamlValueExists(
+            name="First only tag", path=first_file, key="tags", value="only-for-first"
+        ),
+        YamlKeyExists(
+            name="Second tags", path=second_file, key="tags", value=default_tags
+        ),
+    )
+
+    for rule in rules:
+        rule.pre_task_hook()
+        rule.task()
+
+    assert default_tags == ["base"]
+    assert first_file.read_text() == "tags:\n- base\n- only-for-first\n"
+    assert second_file.read_text() == "tags:\n- base\n"
+    first_file.unlink()
+    second_file.unlink()
+
+
+@pytest.mark.integration
+def test_yaml_batch_shared_value_not_modified(temporary_file_generator):
+    first_file = Path(temporary_file_generator(".yaml").name)
+    second_file = Path(temporary_file_generator(".yaml").name)
+
+    default_tags = ["base"]
+
+    rules = (
+        YamlBatch(
+            name="First tags",
+            path=first_file,
+            operations=(
+                YamlKeyExists.as_operation(key="tags", value=default_tags),
+                YamlValueExists.as_operation(key="tags", value="only-for-first"),
+            ),
+        ),
+        YamlBatch(
+            name="Second tags",
+            path=second_file,
+            operations=(YamlKeyExists.as_operation(key="tags", value=default_tags),),
+        ),
+    )
+
+    for rule in rules:
+        rule.pre_task_hook()
+        rule.task()
+
+    assert default_tags == ["base"]
+    assert first_file.read_text() == "tags:\n- base\n- only-for-first\n"
+    assert second_file.read_text() == "tags:\n- base\n"
+    first_file.unlink()
+    second_file.unlink()
@@ -1,13 +1,16 @@
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, PropertyMock, call, patch
+import sys
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 import pytest
 
 from hammurabi.rules.ini import (
+    OptionsNotExist,
     SectionExists,
     SectionNotExists,
     SectionRenamed,
     SingleConfigFileRule,
+    _get_updater_class,
 )
 
 
@@ -38,28 +41,35 @@ def test_single_config_file_rule(mocked_updater_class):
     rule.post_task_hook()
 
     rule.git_add.assert_called_once_with(expected_path)
-    mocked_updater_instance.read.assert_called_once_with(expected_path)
+    mocked_updater_instance.read_string.assert_called_once_with(
+        expected_path.read_text.return_value, source=str(expected_path)
+    )
+
+
+@patch("hammurabi.rules.ini.ConfigUpdater", None)
+def test_get_updater_class_not_installed():
+    with patch.dict(sys.modules, {"configupdater": None}):
+        with pytest.raises(ImportError):
+            _get_updater_class()
 
 
+@patch("hammurabi.rules.ini.PARSED_CONFIGS")
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_exists(mocked_updater_class):
-    mock_file = Mock()
+def test_section_exists(mocked_updater_class, mocked_atomic_write, _):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
     expected_section = Mock()
 
     mock_add_after_return = Mock()
     expected_match = Mock()
+    expected_match.name = expected_match
 
     mocked_prop = PropertyMock(return_value=mock_add_after_return)
     type(expected_match).add_after = mocked_prop
 
     mocked_updater = MagicMock()
-    mocked_updater.__getitem__.return_value = expected_match
-    mocked_updater.sections.return_value = [expected_match]
-    mocked_updater.has_section.side_effect = [False, True]
+    mocked_updater.section_blocks.return_value = [Mock(), expected_match, Mock()]
 
     mocked_updater_class.return_value = mocked_updater
 
@@ -72,35 +82,33 @@ def test_section_exists(mocked_updater_class):
 
     result = rule.task()
 
-    mocked_updater.sections.assert_called_once_with()
-    mocked_updater.has_section.has_calls(call(expected_section), call(expected_match))
+    mocked_updater.section_blocks.assert_called_once_with()
     mocked_prop.assert_called_once_with()
     mock_add_after_return.space.assert_called_once_with(rule.space)
     mock_add_after_return.space.return_value.section.assert_called_once_with(
         expected_section
     )
+    mocked_atomic_write.assert_called_once_with(expected_path)
     assert result == expected_path
 
 
+@patch("hammurabi.rules.ini.PARSED_CONFIGS")
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_exists_add_before(mocked_updater_class):
-    mock_file = Mock()
+def test_section_exists_add_before(mocked_updater_class, mocked_atomic_write, _):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
     expected_section = Mock()
 
     mock_add_before_return = Mock()
     expected_match = Mock()
+    expected_match.name = expected_match
 
     mocked_prop = PropertyMock(return_value=mock_add_before_return)
     type(expected_match).add_before = mocked_prop
 
     mocked_updater = MagicMock()
-    mocked_updater.__getitem__.return_value = expected_match
-    mocked_updater.sections.return_value = [expected_match]
-    mocked_updater.has_section.side_effect = [False, True]
+    mocked_updater.section_blocks.return_value = [Mock(), expected_match, Mock()]
 
     mocked_updater_class.return_value = mocked_updater
 
@@ -114,27 +122,25 @@ def test_section_exists_add_before(mocked_updater_class):
 
     result = rule.task()
 
-    mocked_updater.sections.assert_called_once_with()
-    mocked_updater.has_section.has_calls(call(expected_section), call(expected_match))
+    mocked_updater.section_blocks.assert_called_once_with()
     mocked_prop.assert_called_once_with()
     mock_add_before_return.section.assert_called_once_with(expected_section)
     assert mock_add_before_return.section.return_value.space.called is False
+    mocked_atomic_write.assert_called_once_with(expected_path)
     assert result == expected_path
 
 
+@patch("hammurabi.rules.ini.PARSED_CONFIGS")
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_exists_no_sections(mocked_updater_class):
-    mock_file = Mock()
+def test_section_exists_no_sections(mocked_updater_class, mocked_atomic_write, _):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
     expected_section = Mock()
     expected_match = Mock()
 
     mocked_updater = MagicMock()
-    mocked_updater.sections.return_value = []
-    mocked_updater.has_section.side_effect = [False, False]
+    mocked_updater.section_blocks.return_value = []
 
     mocked_updater_class.return_value = mocked_updater
 
@@ -147,16 +153,16 @@ def test_section_exists_no_sections(mocked_updater_class):
 
     rule.task()
 
-    mocked_updater.sections.assert_called_once_with()
+    mocked_updater.section_blocks.assert_called_once_with()
     mocked_updater.add_section.assert_called_once_with(expected_section)
+    mocked_atomic_write.assert_called_once_with(expected_path)
 
 
+@patch("hammurabi.rules.ini.PARSED_CONFIGS")
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_exists_no_match(mocked_updater_class):
-    mock_file = Mock()
+def test_section_exists_no_match(mocked_updater_class, mocked_atomic_write, _):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
     expected_section = Mock()
 
@@ -167,9 +173,7 @@ def test_section_exists_no_match(mocked_updater_class):
     type(expected_match).add_after = mocked_prop
 
     mocked_updater = MagicMock()
-    mocked_updater.sections.return_value = [expected_match]
-    mocked_updater.section_blocks.return_value = mocked_updater.sections.return_value
-    mocked_updater.has_section.side_effect = [False, False]
+    mocked_updater.section_blocks.return_value = [expected_match]
 
     mocked_updater_class.return_value = mocked_updater
 
@@ -182,22 +186,21 @@ def test_section_exists_no_match(mocked_updater_class):
 
     result = rule.task()
 
-    mocked_updater.sections.assert_called_once_with()
-    mocked_updater.has_section.has_calls(call(expected_section), call(expected_match))
+    mocked_updater.section_blocks.assert_called_once_with()
     mocked_prop.assert_called_once_with()
     mock_add_after_return.space.assert_called_once_with(rule.space)
     mock_add_after_return.space.return_value.section.assert_called_once_with(
         expected_section
     )
+    mocked_atomic_write.assert_called_once_with(expected_path)
     assert result == expected_path
 
 
+@patch("hammurabi.rules.ini.PARSED_CONFIGS")
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_exists_no_match_set(mocked_updater_class):
-    mock_file = Mock()
+def test_section_exists_no_match_set(mocked_updater_class, mocked_atomic_write, _):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
     expected_section = Mock()
 
@@ -209,9 +212,7 @@ def test_section_exists_no_match_set(mocked_updater_class):
 
     mocked_updater = MagicMock()
     mocked_updater.__getitem__.return_value = expected_match
-    mocked_updater.sections.return_value = [Mock(), Mock(), expected_match]
-    mocked_updater.section_blocks.return_value = mocked_updater.sections.return_value
-    mocked_updater.has_section.side_effect = [False, False]
+    mocked_updater.section_blocks.return_value = [Mock(), Mock(), expected_match]
 
     mocked_updater_class.return_value = mocked_updater
 
@@ -221,14 +222,13 @@ def test_section_exists_no_match_set(mocked_updater_class):
 
     result = rule.task()
 
-    mocked_updater.sections.assert_called_once_with()
-    mocked_updater.has_section.has_calls(call(expected_section), call(expected_match))
     mocked_updater.section_blocks.assert_called_once_with()
     mocked_prop.assert_called_once_with()
     mock_add_after_return.space.assert_called_once_with(rule.space)
     mock_add_after_return.space.return_value.section.assert_called_once_with(
         expected_section
     )
+    mocked_atomic_write.assert_called_once_with(expected_path)
     assert result == expected_path
 
 
@@ -250,10 +250,12 @@ def test_section_exists_already_exists(mocked_updater_class):
     type(expected_match).add_before = mocked_before
     type(expected_match).add_after = mocked_after
 
+    existing_section = Mock()
+    existing_section.name = expected_section
+
     mocked_updater = MagicMock()
     mocked_updater.__getitem__.return_value = expected_match
-    mocked_updater.sections.return_value = [expected_match]
-    mocked_updater.has_section.side_effect = [True, True]
+    mocked_updater.section_blocks.return_value = [expected_match, existing_section]
 
     mocked_updater_class.return_value = mocked_updater
 
@@ -266,20 +268,18 @@ def test_section_exists_already_exists(mocked_updater_class):
 
     result = rule.task()
 
-    mocked_updater.has_section.has_calls([call(expected_match), call(expected_section)])
+    mocked_updater.section_blocks.assert_called_once_with()
 
-    assert mocked_updater.sections.called is False
     assert mocked_before.called is False
     assert mocked_after.called is False
     assert result == expected_path
 
 
+@patch("hammurabi.rules.ini.PARSED_CONFIGS")
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_not_exists(mocked_updater_class):
-    mock_file = Mock()
+def test_section_not_exists(mocked_updater_class, mocked_atomic_write, _):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
     expected_section = Mock()
 
@@ -296,15 +296,14 @@ def test_section_not_exists(mocked_updater_class):
 
     mocked_updater.has_section.assert_called_once_with(expected_section)
     mocked_updater.remove_section.assert_called_once_with(expected_section)
+    mocked_atomic_write.assert_called_once_with(expected_path)
     assert result == expected_path
 
 
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_not_exists_no_section(mocked_updater_class):
-    mock_file = Mock()
+def test_section_not_exists_no_section(mocked_updater_class, mocked_atomic_write):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
     expected_section = Mock()
 
@@ -321,124 +320,150 @@ def test_section_not_exists_no_section(mocked_updater_class):
 
     mocked_updater.has_section.assert_called_once_with(expected_section)
     assert mocked_updater.remove_section.called is False
+    assert mocked_atomic_write.called is False
     assert result == expected_path
 
 
+@patch("hammurabi.rules.ini.PARSED_CONFIGS")
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_renamed(mocked_updater_class):
-    mock_file = Mock()
+def test_section_renamed(mocked_updater_class, mocked_atomic_write, _):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
-    expected_section = Mock(name="banana")
+    expected_section = Mock()
+    expected_section.name = "banana"
     new_section_name = "apple"
 
     mocked_updater = MagicMock()
-    mocked_updater.__getitem__.return_value = expected_section
-    mocked_updater.sections.return_value = [expected_section]
-    mocked_updater.has_section.side_effect = [True, False]
+    mocked_updater.section_blocks.return_value = [Mock(), expected_section]
 
     mocked_updater_class.return_value = mocked_updater
 
     rule = SectionRenamed(
         name="Section exists rule",
         path=expected_path,
-        section=expected_section,
+        section="banana",
         new_name=new_section_name,
     )
 
     result = rule.task()
 
-    mocked_updater.has_section.has_calls(call(expected_section), call(new_section_name))
+    mocked_updater.section_blocks.assert_called_once_with()
     assert expected_section.name == new_section_name
+    mocked_atomic_write.assert_called_once_with(expected_path)
     assert result == expected_path
 
 
 @patch("hammurabi.rules.ini.ConfigUpdater")
 def test_section_renamed_no_section(mocked_updater_class):
-    mock_file = Mock()
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
-    expected_section = Mock(name="banana")
-    original_section_name = expected_section.name
+    expected_section = Mock()
+    expected_section.name = "banana"
     new_section_name = "apple"
 
     mocked_updater = MagicMock()
-    mocked_updater.has_section.side_effect = [False, False]
+    mocked_updater.section_blocks.return_value = [expected_section]
 
     mocked_updater_class.return_value = mocked_updater
 
     rule = SectionRenamed(
         name="Section exists rule",
         path=expected_path,
-        section=expected_section,
+        section="orange",
         new_name=new_section_name,
     )
 
     with pytest.raises(LookupError):
         rule.task()
 
-    mocked_updater.has_section.has_calls(call(expected_section), call(new_section_name))
-    assert expected_section.name == original_section_name
+    mocked_updater.section_blocks.assert_called_once_with()
+    assert expected_section.name == "banana"
 
 
 @patch("hammurabi.rules.ini.ConfigUpdater")
 def test_section_renamed_has_old_and_new_name(mocked_updater_class):
-    mock_file = Mock()
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
-    expected_section = Mock(name="banana")
-    original_section_name = expected_section.name
-    new_section_name = "apple"
+    expected_section = Mock()
+    expected_section.name = "banana"
+    new_section = Mock()
+    new_section.name = "apple"
 
     mocked_updater = MagicMock()
-    mocked_updater.has_section.side_effect = [True, True]
+    mocked_updater.section_blocks.return_value = [expected_section, new_section]
 
     mocked_updater_class.return_value = mocked_updater
 
     rule = SectionRenamed(
         name="Section exists rule",
         path=expected_path,
-        section=expected_section,
-        new_name=new_section_name,
+        section="banana",
+        new_name="apple",
     )
 
     with pytest.raises(LookupError):
         rule.task()
 
-    mocked_updater.has_section.has_calls(call(expected_section), call(new_section_name))
-    assert expected_section.name == original_section_name
+    mocked_updater.section_blocks.assert_called_once_with()
+    assert expected_section.name == "banana"
 
 
+@patch("hammurabi.rules.ini.atomic_write")
 @patch("hammurabi.rules.ini.ConfigUpdater")
-def test_section_renamed_already_has_new_name(mocked_updater_class):
-    mock_file = Mock()
+def test_section_renamed_already_has_new_name(
+    mocked_updater_class, mocked_atomic_write
+):
     expected_path = Mock()
-    expected_path.open.return_value.__enter__ = Mock(return_value=mock_file)
-    expected_path.open.return_value.__exit__ = Mock()
 
-    expected_section = Mock(name="banana")
-    original_section_name = expected_section.name
-    new_section_name = "apple"
+    new_section = Mock()
+    new_section.name = "apple"
 
     mocked_updater = MagicMock()
-    mocked_updater.has_section.side_effect = [False, True]
+    mocked_updater.section_blocks.return_value = [new_section]
 
     mocked_updater_class.return_value = mocked_updater
 
     rule = SectionRenamed(
         name="Section exists rule",
         path=expected_path,
-        section=expected_section,
-        new_name=new_section_name,
+        section="banana",
+        new_name="apple",
     )
 
     rule.task()
 
-    mocked_updater.has_section.has_calls(call(expected_section), call(new_section_name))
-    assert expected_section.name == original_section_name
+    mocked_updater.section_blocks.assert_called_once_with()
+    assert new_section.name == "apple"
+    assert mocked_atomic_write.called is False
+
+
+@patch("hammurabi.rules.ini.atomic_write")
+@patch("hammurabi.rules.ini.ConfigUpdater")
+def test_options_not_exist_nothing_removed(mocked_updater_class, mocked_atomic_write):
+    expected_path = Mock()
+    expected_section = Mock()
+
+    mocked_section = MagicMock()
+    mocked_section.options.return_value = ["existing"]
+
+    mocked_updater = MagicMock()
+    mocked_updater.__getitem__.return_value = mocked_section
+    mocked_updater.optionxform.side_effect = str.lower
+
+    mocked_updater_class.return_value = mocked_updater
+
+    rule = OptionsNotExist(
+        name="Options not exist rule",
+        path=expected_path,
+        section=expected_section,
+        options=("missing",),
+    )
+
+    result = rule.task()
+
+    mocked_updater.__getitem__.assert_called_once_with(expected_section)
+    assert mocked_section.__delitem__.called is False
+    assert mocked_updater.write.called is False
+    assert mocked_atomic_write.called is False
+    assert result == expected_path
@@ -1,6 +1,7 @@
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+from hammurabi.helpers import copy_file
 from hammurabi.rules.operations import Copied, Moved, Renamed
 
 
@@ -17,13 +18,15 @@ def test_moved(mocked_shutil):
     rule.post_task_hook()
 
     assert result == destination
-    mocked_shutil.move.assert_called_once_with(source, destination)
+    mocked_shutil.move.assert_called_once_with(
+        source, destination, copy_function=copy_file
+    )
     rule.git_remove.assert_called_once_with(source)
     rule.git_add.assert_called_once_with(destination)
 
 
-@patch("hammurabi.rules.operations.shutil")
-def test_renamed(mocked_shutil):
+@patch.object(Path, "rename", autospec=True)
+def test_renamed(mocked_rename):
     source = Path("/tmp/apple/tree")
     new_name = "tree2"
     destination = Path("/tmp/apple/", new_name)
@@ -36,13 +39,13 @@ def test_renamed(mocked_shutil):
     rule.post_task_hook()
 
     assert result == destination
-    mocked_shutil.move.assert_called_once_with(source, destination)
+    mocked_rename.assert_called_once_with(source, destination)
     rule.git_remove.assert_called_once_with(source)
     rule.git_add.assert_called_once_with(destination)
 
 
-@patch("hammurabi.rules.operations.shutil")
-def test_file_copied(mocked_shutil):
+@patch("hammurabi.rules.operations.copy_file")
+def test_file_copied(mocked_copy_file):
     source = Mock()
     destination = Mock()
     source.is_dir.return_value = False
@@ -54,12 +57,12 @@ def test_file_copied(mocked_shutil):
     rule.post_task_hook()
 
     assert result == destination
-    mocked_shutil.copy2.assert_called_once_with(source, destination)
+    mocked_copy_file.assert_called_once_with(source, destination)
     rule.git_add.assert_called_once_with(destination)
 
 
-@patch("hammurabi.rules.operations.shutil")
-def test_directory_copied(mocked_shutil):
+@patch("hammurabi.rules.operations.copy_tree")
+def test_directory_copied(mocked_copy_tree):
     source = Mock()
     destination = Mock()
     source.is_dir.return_value = True
@@ -71,5 +74,5 @@ def test_directory_copied(mocked_shutil):
     rule.post_task_hook()
 
     assert result == destination
-    mocked_shutil.copytree.assert_called_once_with(source, destination)
+    mocked_copy_tree.assert_called_once_with(source, destination)
     rule.git_add.assert_called_once_with(destination)
@@ -3,12 +3,17 @@ from unittest.mock import Mock, patch
 from hammurabi.rules.templates import TemplateRendered
 
 
-@patch("hammurabi.rules.templates.Template")
-def test_rendered(mocked_template):
-    mock_rendered_template = Mock()
+@patch("hammurabi.rules.templates.atomic_write")
+@patch("hammurabi.rules.templates.get_template")
+def test_rendered(mocked_get_template, mocked_atomic_write):
+    mock_stream = Mock()
     mock_template = Mock()
-    mock_template.render.return_value = mock_rendered_template
-    mocked_template.return_value = mock_template
+    mock_template.stream.return_value = mock_stream
+    mocked_get_template.return_value = mock_template
+
+    mock_file = Mock()
+    mocked_atomic_write.return_value.__enter__ = Mock(return_value=mock_file)
+    mocked_atomic_write.return_value.__exit__ = Mock(return_value=None)
 
     template_path = Mock()
     expected_destination = Mock()
@@ -26,8 +31,10 @@ def test_rendered(mocked_template):
     result = rule.task()
     rule.post_task_hook()
 
-    mock_template.render.assert_called_once_with(expected_context)
-    expected_destination.write_text.assert_called_once_with(mock_rendered_template)
+    mocked_get_template.assert_called_once_with(template_path)
+    mock_template.stream.assert_called_once_with(expected_context)
+    mocked_atomic_write.assert_called_once_with(expected_destination, "wb")
+    mock_stream.dump.assert_called_once_with(mock_file, encoding="utf-8")
 
     rule.git_add.assert_called_once_with(expected_destination)
 
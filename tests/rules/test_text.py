@@ -1,8 +1,18 @@
+import re
 from unittest.mock import Mock, call, patch
 
 import pytest
 
-from hammurabi.rules.text import LineExists, LineNotExists, LineReplaced
+from hammurabi.rules.text import (
+    INDENTATION_PATTERN,
+    LineBatch,
+    LineExists,
+    LineNotExists,
+    LineReplaced,
+    _get_indentation,
+    _get_literal_prefix,
+    _join_lines,
+)
 
 
 def get_line_exists_rule(
@@ -49,11 +59,26 @@ def test_line_exists():
 
     result = rule.task()
 
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == [f"{match}\n", f"{rule.text}\n", "other line\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"{match}\n{rule.text}\nother line\n"
     assert result == expected_path
 
 
+def test_line_exists_ignore_case():
+    expected_path = Mock()
+
+    rule, mock_file = get_line_exists_rule(
+        path=expected_path,
+        match=re.compile("match", re.IGNORECASE),
+        lines=["Match", "other line"],
+    )
+
+    rule.task()
+
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"Match\n{rule.text}\nother line\n"
+
+
 def test_line_exists_no_newline():
     expected_path = Mock()
     expected_text = "apple tree"
@@ -71,8 +96,8 @@ def test_line_exists_no_newline():
     # Although this test seems bit odd, we must ensure that
     # developers can use `$` regexp for end of file even if the
     # file has no newline char at the end of it.
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == ["some\n", "lines\n", "\n", f"{expected_text}\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"some\nlines\n\n{expected_text}\n"
     assert result == expected_path
 
 
@@ -86,8 +111,8 @@ def test_line_exists_insert_before():
 
     rule.task()
 
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == [f"{rule.text}\n", f"{match}\n", "other line\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"{rule.text}\n{match}\nother line\n"
 
 
 def test_line_exists_with_indentation():
@@ -100,8 +125,51 @@ def test_line_exists_with_indentation():
 
     rule.task()
 
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == [f"{match}\n", f"{rule.text}\n", "other line\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"{match}\n\t{rule.text}\nother line\n"
+    assert rule.text == "Example text"
+
+
+def test_line_exists_already_added():
+    expected_path = Mock()
+    match = "match"
+
+    rule, mock_file = get_line_exists_rule(
+        path=expected_path, match=match, lines=[match, "Example text", "other line"]
+    )
+
+    rule.task()
+
+    assert mock_file.write.called is False
+
+
+def test_line_exists_already_added_before():
+    expected_path = Mock()
+    match = "match"
+
+    rule, mock_file = get_line_exists_rule(
+        path=expected_path,
+        match=match,
+        lines=["Example text", match, "other line"],
+        position=0,
+    )
+
+    rule.task()
+
+    assert mock_file.write.called is False
+
+
+def test_line_exists_already_added_with_indentation():
+    expected_path = Mock()
+    match = "\tmatch"
+
+    rule, mock_file = get_line_exists_rule(
+        path=expected_path, match=match, lines=[match, "\tExample text"]
+    )
+
+    rule.task()
+
+    assert mock_file.write.called is False
 
 
 @patch("hammurabi.rules.text.re")
@@ -111,7 +179,7 @@ def test_line_exists_re_compiled(mocked_re):
 
     get_line_exists_rule(path=expected_path, match=match)
 
-    mocked_re.compile.assert_has_calls([call(match), call(r"^\s+")])
+    mocked_re.compile.assert_called_once_with(match)
 
 
 def test_line_exists_empty_file():
@@ -122,8 +190,8 @@ def test_line_exists_empty_file():
 
     rule.task()
 
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == [f"{rule.text}\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"{rule.text}\n"
 
 
 def test_line_exists_no_match():
@@ -138,7 +206,7 @@ def test_line_exists_no_match():
         rule.task()
 
     assert str(exc.value).startswith("No matching line for")
-    assert mock_file.writelines.called is False
+    assert mock_file.write.called is False
 
 
 def test_line_exists_multiple_matches():
@@ -151,8 +219,8 @@ def test_line_exists_multiple_matches():
 
     result = rule.task()
 
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == [f"{match}\n", "match\n", f"{rule.text}\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"{match}\nmatch\n{rule.text}\n"
     assert result == expected_path
 
 
@@ -169,8 +237,8 @@ def test_line_not_exists():
 
     result = rule.task()
 
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == ["one\n", "three\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == "one\nthree\n"
     assert result == expected_path
 
 
@@ -197,7 +265,7 @@ def test_line_not_exists_no_match():
 
     rule.task()
 
-    assert mock_file.writelines.called is False
+    assert mock_file.write.called is False
 
 
 def test_line_replaced():
@@ -208,8 +276,8 @@ def test_line_replaced():
 
     result = rule.task()
 
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == [f"{replacement}\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"{replacement}\n"
     assert result == expected_path
 
 
@@ -226,8 +294,26 @@ def test_line_replaced_with_indentation():
 
     rule.task()
 
-    write_args = list(mock_file.writelines.call_args[0][0])
-    assert write_args == [f"\t{replacement}\n", "other line\n"]
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"\t{replacement}\nother line\n"
+
+
+def test_line_replaced_multiple_with_indentation():
+    expected_path = Mock()
+    replacement = "replacement"
+
+    rule, mock_file = get_line_replaced_rule(
+        path=expected_path,
+        text=replacement,
+        match=r"\s*replace me",
+        lines=["\treplace me", "\t\treplace me", "replace me"],
+    )
+
+    rule.task()
+
+    write_args = mock_file.write.call_args[0][0]
+    assert write_args == f"\t{replacement}\n\t\t{replacement}\n{replacement}\n"
+    assert rule.text == replacement
 
 
 @patch("hammurabi.rules.text.re")
@@ -237,7 +323,7 @@ def test_line_replaced_re_compiled(mocked_re):
 
     get_line_replaced_rule(path=expected_path, match=match)
 
-    mocked_re.compile.assert_has_calls([call(match), call(r"^\s+")])
+    mocked_re.compile.assert_called_once_with(match)
 
 
 def test_line_replaced_empty_file():
@@ -251,7 +337,7 @@ def test_line_replaced_empty_file():
     with pytest.raises(LookupError):
         rule.task()
 
-    assert mock_file.writelines.called is False
+    assert mock_file.write.called is False
 
 
 def test_line_replaced_no_match():
@@ -263,7 +349,7 @@ def test_line_replaced_no_match():
         rule.task()
 
     assert str(exc.value).startswith("No matching line for")
-    assert mock_file.writelines.called is False
+    assert mock_file.write.called is False
 
 
 def test_line_replaced_no_match_but_text():
@@ -276,7 +362,7 @@ def test_line_replaced_no_match_but_text():
 
     result = rule.task()
 
-    assert mock_file.writelines.called is False
+    assert mock_file.write.called is False
     assert result == expected_path
 
 
@@ -291,7 +377,7 @@ def test_line_replaced_no_match_no_text():
         rule.task()
 
     assert str(exc.value).startswith("No matching line for")
-    assert mock_file.writelines.called is False
+    assert mock_file.write.called is False
 
 
 def test_line_replaced_both_match_and_text():
@@ -308,4 +394,121 @@ def test_line_replaced_both_match_and_text():
 
     # Use rule.match because of transformations on it
     assert str(exc.value) == f'Both "{rule.match}" and "{rule.text}" exists'
-    assert mock_file.writelines.called is False
+    assert mock_file.write.called is False
+
+
+@pytest.mark.parametrize(
+    "pattern,flags,expected_prefix",
+    [
+        ("keepalive = 65", 0, "keepalive = 65"),
+        ("^bind.*", 0, "bind"),
+        ("colou?r", 0, "colo"),
+        ("abc+d", 0, "abc"),
+        ("keep|bind", 0, ""),
+        ("(?i)keepalive", 0, ""),
+        ("(?x)keep alive", 0, ""),
+        ("keepalive", re.IGNORECASE, ""),
+        ("keep alive", re.VERBOSE, ""),
+    ],
+)
+def test_get_literal_prefix(pattern, flags, expected_prefix):
+    assert _get_literal_prefix(re.compile(pattern, flags)) == expected_prefix
+
+
+@pytest.mark.parametrize(
+    "lines,expected_content",
+    [([], ""), ([""], "\n"), (["one", "two"], "one\ntwo\n")],
+)
+def test_join_lines(lines, expected_content):
+    assert _join_lines(lines) == expected_content
+
+
+@pytest.mark.parametrize(
+    "line,pattern,expected_indentation",
+    [
+        ("\t  text", INDENTATION_PATTERN, "\t  "),
+        ("text", INDENTATION_PATTERN, ""),
+        ("   ", INDENTATION_PATTERN, "   "),
+        ("\t  text", re.compile(r"^\t"), "\t"),
+        ("text", re.compile(r"^\t"), ""),
+    ],
+)
+def test_get_indentation(line, pattern, expected_indentation):
+    assert _get_indentation(line, pattern) == expected_indentation
+
+
+def test_line_batch():
+    expected_path = Mock()
+    mock_file = Mock()
+    mock_file.read.return_value.splitlines.return_value = [
+        "bind = 0.0.0.0",
+        "kepalive = 2",
+        "reload = True",
+    ]
+
+    rule = LineBatch(
+        name="Line batch rule",
+        path=expected_path,
+        operations=(
+            LineReplaced.as_operation(text="keepalive = 65", match=r"^kepalive.*"),
+            LineExists.as_operation(text="timeout = 30", match=r"^keepalive.*"),
+            LineNotExists.as_operation(text=r"^reload.*"),
+        ),
+    )
+
+    rule.param.open.return_value.__enter__ = Mock(return_value=mock_file)
+    rule.param.open.return_value.__exit__ = Mock()
+
+    result = rule.task()
+
+    mock_file.write.assert_called_once_with(
+        "bind = 0.0.0.0\nkeepalive = 65\ntimeout = 30\n"
+    )
+    assert result == expected_path
+
+
+def test_line_batch_no_changes():
+    expected_path = Mock()
+    mock_file = Mock()
+    mock_file.read.return_value.splitlines.return_value = ["keepalive = 65"]
+
+    rule = LineBatch(
+        name="Line batch rule",
+        path=expected_path,
+        operations=(
+            LineReplaced.as_operation(text="keepalive = 65", match=r"^kepalive.*"),
+            LineNotExists.as_operation(text=r"^reload.*"),
+        ),
+    )
+
+    rule.param.open.return_value.__enter__ = Mock(return_value=mock_file)
+    rule.param.open.return_value.__exit__ = Mock()
+
+    rule.task()
+
+    assert mock_file.write.called is False
+
+
+def test_line_batch_operation_error():
+    mock_file = Mock()
+    mock_file.read.return_value.splitlines.return_value = ["keepalive = 65"]
+
+    rule = LineBatch(
+        name="Line batch rule",
+        path=Mock(),
+        operations=(LineExists.as_operation(text="timeout = 30", match=r"^bind.*"),),
+    )
+
+    rule.param.open.return_value.__enter__ = Mock(return_value=mock_file)
+    rule.param.open.return_value.__exit__ = Mock()
+
+    with pytest.raises(LookupError):
+        rule.task()
+
+    assert mock_file.write.called is False
+
+
+def test_as_operation_name():
+    operation = LineNotExists.as_operation(text=r"^reload.*")
+
+    assert operation.__self__.name == "LineNotExists"
@@ -1,10 +1,29 @@
+import errno
+import os
+from pathlib import Path
 import random
 import re
+import shutil
+import stat
+from unittest.mock import patch
 
 from hypothesis import given
 from hypothesis import strategies as st
+import pytest
 
-from hammurabi.helpers import full_strip
+from hammurabi.helpers import (
+    FICLONE,
+    ParsedFileCache,
+    atomic_write,
+    clear_parsed_file_caches,
+    copy_file,
+    copy_tree,
+    full_strip,
+    read_file_bytes,
+)
+from tests.fixtures import temporary_dir
+
+assert temporary_dir
 
 WHITESPACE_PATTERN = re.compile(r"\s+.*(\s+)?")
 
@@ -36,3 +55,316 @@ def test_full_strip_multiple_lines(value):
     result = full_strip(test_input)
 
     assert not WHITESPACE_PATTERN.match(result)
+
+
+def test_atomic_write(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_text("original")
+    expected_file.chmod(0o640)
+
+    with atomic_write(expected_file) as file:
+        file.write("replaced")
+
+    assert expected_file.read_text() == "replaced"
+    assert stat.S_IMODE(expected_file.stat().st_mode) == 0o640
+    assert list(Path(temporary_dir).iterdir()) == [expected_file]
+
+
+def test_atomic_write_new_file(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+
+    with atomic_write(expected_file) as file:
+        file.write("created")
+
+    umask = os.umask(0)
+    os.umask(umask)
+
+    assert expected_file.read_text() == "created"
+    assert stat.S_IMODE(expected_file.stat().st_mode) == 0o666 & ~umask
+
+
+def test_atomic_write_symlink(temporary_dir):
+    target_file = Path(temporary_dir, "shared", "test.txt")
+    target_file.parent.mkdir()
+    target_file.write_text("original")
+    target_file.chmod(0o640)
+
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.symlink_to(target_file)
+
+    with atomic_write(expected_file) as file:
+        file.write("replaced")
+
+    assert expected_file.is_symlink()
+    assert target_file.read_text() == "replaced"
+    assert stat.S_IMODE(target_file.stat().st_mode) == 0o640
+    assert list(target_file.parent.iterdir()) == [target_file]
+
+
+def test_atomic_write_error(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_text("original")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(expected_file) as file:
+            file.write("partial")
+            raise RuntimeError("failed")
+
+    assert expected_file.read_text() == "original"
+    assert list(Path(temporary_dir).iterdir()) == [expected_file]
+
+
+def test_parsed_file_cache(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_text("content")
+    expected_content = object()
+
+    cache = ParsedFileCache()
+    cache.put(expected_file, expected_content)
+
+    assert cache.take(expected_file) is expected_content
+    assert cache.take(expected_file) is None
+
+
+def test_parsed_file_cache_modified(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_text("content")
+
+    cache = ParsedFileCache()
+    cache.put(expected_file, object())
+
+    expected_file.write_text("modified content")
+
+    assert cache.take(expected_file) is None
+
+
+def test_parsed_file_cache_same_size_rewrite(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_text("content")
+    original_stat = expected_file.stat()
+
+    cache = ParsedFileCache()
+    cache.put(expected_file, object())
+
+    # Same size content with the original modification time, like an external
+    # rewrite within the same tick of a file system with coarse timestamps
+    expected_file.write_text("CONTENT")
+    os.utime(expected_file, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+
+    assert cache.take(expected_file) is None
+
+
+def test_parsed_file_cache_same_signature_rewrite(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_text("content")
+
+    cache = ParsedFileCache()
+
+    # In place rewrite of the same size within a single timestamp tick
+    with patch("hammurabi.helpers.get_file_signature", return_value=(1, 2, 3, 7)):
+        cache.put(expected_file, object())
+        expected_file.write_text("CONTENT")
+
+        assert cache.take(expected_file) is None
+
+
+def test_clear_parsed_file_caches(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_text("content")
+
+    cache = ParsedFileCache()
+    cache.put(expected_file, object())
+
+    clear_parsed_file_caches()
+
+    assert cache.take(expected_file) is None
+
+
+def test_parsed_file_cache_removed(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_text("content")
+
+    cache = ParsedFileCache()
+    cache.put(expected_file, object())
+
+    expected_file.unlink()
+
+    assert cache.take(expected_file) is None
+
+
+def test_read_file_bytes(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_bytes(b"content")
+
+    assert read_file_bytes(expected_file) == b"content"
+
+
+def test_read_file_bytes_empty(temporary_dir):
+    expected_file = Path(temporary_dir, "test.txt")
+    expected_file.write_bytes(b"")
+
+    assert read_file_bytes(expected_file) == b""
+
+
+def test_copy_file(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.write_text("content")
+    source.chmod(0o640)
+    destination = Path(temporary_dir, "destination.txt")
+
+    result = copy_file(source, destination)
+
+    assert result == destination
+    assert destination.read_text() == "content"
+    assert stat.S_IMODE(destination.stat().st_mode) == 0o640
+
+
+def test_copy_file_into_directory(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.write_text("content")
+    directory = Path(temporary_dir, "directory")
+    directory.mkdir()
+
+    result = copy_file(source, directory)
+
+    assert result == Path(directory, "source.txt")
+    assert result.read_text() == "content"
+
+
+def test_copy_file_range_not_supported(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.write_text("content")
+    destination = Path(temporary_dir, "destination.txt")
+
+    with patch("hammurabi.helpers._clone_file", return_value=False), patch.object(
+        os,
+        "copy_file_range",
+        side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+        create=True,
+    ) as mocked_copy_file_range:
+        copy_file(source, destination)
+
+    mocked_copy_file_range.assert_called_once()
+    assert destination.read_text() == "content"
+
+
+def test_copy_file_range_zero_size_source(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.write_text("content")
+    destination = Path(temporary_dir, "destination.txt")
+
+    # Files of procfs or sysfs report zero size, so the kernel copies nothing
+    with patch("hammurabi.helpers._clone_file", return_value=False), patch.object(
+        os, "copy_file_range", return_value=0, create=True
+    ) as mocked_copy_file_range:
+        copy_file(source, destination)
+
+    mocked_copy_file_range.assert_called_once()
+    assert destination.read_text() == "content"
+
+
+def test_copy_file_empty_source(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.touch()
+    destination = Path(temporary_dir, "destination.txt")
+
+    copy_file(source, destination)
+
+    assert destination.read_text() == ""
+
+
+def test_copy_file_range_not_available(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.write_text("content")
+    destination = Path(temporary_dir, "destination.txt")
+
+    with patch.object(os, "copy_file_range", None, create=True):
+        copy_file(source, destination)
+
+    assert destination.read_text() == "content"
+
+
+def test_copy_file_cloned(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.write_text("content")
+    destination = Path(temporary_dir, "destination.txt")
+
+    with patch("hammurabi.helpers.fcntl") as mocked_fcntl, patch(
+        "hammurabi.helpers.sys.platform", "linux"
+    ), patch.object(os, "copy_file_range", create=True) as mocked_copy_file_range:
+        copy_file(source, destination)
+
+    mocked_fcntl.ioctl.assert_called_once()
+    assert mocked_fcntl.ioctl.call_args[0][1] == FICLONE
+    assert mocked_copy_file_range.called is False
+
+
+def test_copy_file_clone_not_supported(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.write_text("content")
+    destination = Path(temporary_dir, "destination.txt")
+
+    with patch("hammurabi.helpers.fcntl") as mocked_fcntl, patch(
+        "hammurabi.helpers.sys.platform", "linux"
+    ):
+        mocked_fcntl.ioctl.side_effect = OSError(errno.EOPNOTSUPP, "Not supported")
+        copy_file(source, destination)
+
+    mocked_fcntl.ioctl.assert_called_once()
+    assert destination.read_text() == "content"
+
+
+def test_copy_file_buffered(temporary_dir):
+    source = Path(temporary_dir, "source.txt")
+    source.write_text("longer content than the buffer")
+    destination = Path(temporary_dir, "destination.txt")
+
+    with patch("hammurabi.helpers._kernel_copy", return_value=False), patch(
+        "hammurabi.helpers.COPY_BUFFER_SIZE", 4
+    ):
+        copy_file(source, destination)
+
+    assert destination.read_text() == "longer content than the buffer"
+
+
+def test_copy_tree(temporary_dir):
+    source = Path(temporary_dir, "source")
+    Path(source, "nested").mkdir(parents=True)
+    Path(source, "file.txt").write_text("content")
+    Path(source, "nested", "file.txt").write_text("nested content")
+    os.utime(source, ns=(0, 0))
+    destination = Path(temporary_dir, "destination")
+
+    result = copy_tree(source, destination)
+
+    assert result == destination
+    assert Path(destination, "file.txt").read_text() == "content"
+    assert Path(destination, "nested", "file.txt").read_text() == "nested content"
+    assert destination.stat().st_mtime_ns == 0
+
+
+def test_copy_tree_error(temporary_dir):
+    source = Path(temporary_dir, "source")
+    source.mkdir()
+    Path(source, "file.txt").write_text("content")
+    destination = Path(temporary_dir, "destination")
+
+    with patch("hammurabi.helpers.copy_file", side_effect=OSError("error")):
+        with pytest.raises(OSError):
+            copy_tree(source, destination)
+
+
+def test_copy_tree_error_keeps_tree_error(temporary_dir):
+    source = Path(temporary_dir, "source")
+    source.mkdir()
+    Path(source, "file.txt").write_text("content")
+    destination = Path(temporary_dir, "destination")
+
+    def failing_copytree(tree_source, tree_destination, copy_function):
+        copy_function(str(tree_source / "file.txt"), str(tree_destination))
+        raise shutil.Error("tree error")
+
+    with patch("hammurabi.helpers.copy_file", side_effect=OSError("copy error")):
+        with patch("hammurabi.helpers.shutil.copytree", new=failing_copytree):
+            with pytest.raises(shutil.Error, match="tree error"):
+                copy_tree(source, destination)
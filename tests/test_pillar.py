@@ -1,11 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
-from hammurabi import Pillar
+from hammurabi import Law, Pillar, SectionExists, YamlKeyExists, YamlKeyNotExists
+from tests.fixtures import temporary_file, temporary_file_generator
 from tests.helpers import get_passing_rule
 
+assert temporary_file
+assert temporary_file_generator
+
 
 @patch("hammurabi.pillar.JsonReporter")
 def test_register(mocked_reporter):
@@ -106,6 +112,7 @@ def test_enforce(mocked_reporter, mocked_datetime):
     pillar = Pillar(mocked_reporter, notifications=[mock_notification])
     pillar.register(expected_law)
     pillar.checkout_branch = Mock()
+    pillar.prefetch = Mock()
     pillar.push_changes = Mock()
     pillar.create_pull_request = Mock()
     pillar.create_pull_request.return_value = expected_pr_url
@@ -114,6 +121,7 @@ def test_enforce(mocked_reporter, mocked_datetime):
 
     expected_law.enforce.assert_called_once_with()
     pillar.checkout_branch.assert_called_once_with()
+    assert pillar.prefetch.called is False
     pillar.push_changes.assert_called_once_with()
     pillar.create_pull_request.assert_called_once_with()
     mock_notification.send.assert_called_once_with(expected_pr_url)
@@ -124,7 +132,23 @@ def test_enforce(mocked_reporter, mocked_datetime):
 
 
 @patch("hammurabi.pillar.JsonReporter")
-def test_enforce_failed(_):
+def test_enforce_prefetch_files(_):
+    expected_law = Mock()
+    pillar = Pillar(prefetch_files=True)
+    pillar.register(expected_law)
+    pillar.checkout_branch = Mock()
+    pillar.prefetch = Mock()
+    pillar.push_changes = Mock(return_value=False)
+
+    pillar.enforce()
+
+    pillar.prefetch.assert_called_once_with()
+    expected_law.enforce.assert_called_once_with()
+
+
+@patch("hammurabi.pillar.clear_parsed_file_caches")
+@patch("hammurabi.pillar.JsonReporter")
+def test_enforce_failed(_, mocked_clear):
     expected_law = Mock()
     expected_law.enforce.side_effect = Exception()
 
@@ -133,6 +157,7 @@ def test_enforce_failed(_):
     pillar.create_lock_file = Mock()
     pillar.release_lock_file = Mock()
     pillar.checkout_branch = Mock()
+    pillar.prefetch = Mock()
     pillar.push_changes = Mock()
     pillar.create_pull_request = Mock()
 
@@ -141,6 +166,8 @@ def test_enforce_failed(_):
 
     expected_law.enforce.assert_called_once_with()
     pillar.checkout_branch.assert_called_once_with()
+    assert pillar.prefetch.called is False
+    mocked_clear.assert_called_once_with()
     assert pillar.push_changes.called is False
     assert pillar.create_pull_request.called is False
 
@@ -153,6 +180,7 @@ def test_enforce_no_changes(_):
     pillar = Pillar(notifications=[mock_notification])
     pillar.register(expected_law)
     pillar.checkout_branch = Mock()
+    pillar.prefetch = Mock()
     pillar.push_changes = Mock(return_value=False)
     pillar.create_pull_request = Mock()
 
@@ -160,6 +188,89 @@ def test_enforce_no_changes(_):
 
     expected_law.enforce.assert_called_once_with()
     pillar.checkout_branch.assert_called_once_with()
+    assert pillar.prefetch.called is False
     pillar.push_changes.assert_called_once_with()
     assert pillar.create_pull_request.called is False
     assert mock_notification.send.called is False
+
+
+@patch("hammurabi.pillar.JsonReporter")
+def test_prefetch_ini(_, temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("[main]\n")
+
+    rule = SectionExists(name="Section exists", path=expected_file, section="other")
+    other_rule = SectionExists(name="Other", path=expected_file, section="another")
+    pillar = Pillar()
+    pillar.register(Law(name="Law", description="", rules=(rule, other_rule)))
+
+    with patch("hammurabi.rules.ini.read_config_file") as mocked_read:
+        pillar.prefetch()
+
+    mocked_read.assert_called_once_with(expected_file)
+
+    pillar.prefetch()
+    expected_file.write_text("[modified]\n")
+
+    rule.pre_task_hook()
+    other_rule.pre_task_hook()
+
+    assert rule.updater.sections() == ["modified"]
+    assert other_rule.updater.sections() == ["modified"]
+    expected_file.unlink()
+
+
+@patch("hammurabi.pillar.JsonReporter")
+def test_prefetch_yaml(_, temporary_file):
+    expected_file = Path(temporary_file.name)
+    expected_file.write_text("stack: python\n")
+
+    rule = YamlKeyExists(name="Key exists", path=expected_file, key="stack")
+    other_rule = YamlKeyNotExists(name="Other", path=expected_file, key="other")
+    pillar = Pillar()
+    pillar.register(Law(name="Law", description="", rules=(rule, other_rule)))
+
+    with patch("hammurabi.rules.yaml.read_yaml_file") as mocked_read:
+        pillar.prefetch()
+
+    mocked_read.assert_called_once_with(expected_file)
+
+    pillar.prefetch()
+
+    with patch.object(Path, "read_text") as mocked_read_text:
+        rule.pre_task_hook()
+
+    mocked_read_text.assert_not_called()
+    assert rule.loaded_data == {"stack": "python"}
+
+    expected_file.write_text("stack: scala\n")
+    other_rule.pre_task_hook()
+
+    assert other_rule.loaded_data == {"stack": "scala"}
+    expected_file.unlink()
+
+
+@patch("hammurabi.pillar.JsonReporter")
+def test_prefetch_single_pool(_, temporary_file_generator):
+    ini_file = Path(temporary_file_generator(".cfg").name)
+    ini_file.write_text("[main]\n")
+    yaml_file = Path(temporary_file_generator(".yaml").name)
+    yaml_file.write_text("stack: python\n")
+
+    rules = (
+        SectionExists(name="Section exists", path=ini_file, section="other"),
+        YamlKeyExists(name="Key exists", path=yaml_file, key="stack"),
+    )
+    pillar = Pillar()
+    pillar.register(Law(name="Law", description="", rules=rules))
+
+    with patch(
+        "hammurabi.pillar.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+    ) as mocked_executor:
+        pillar.prefetch()
+
+    mocked_executor.assert_called_once_with(max_workers=2)
+    assert rules[0]._prefetched[1] == "[main]\n"
+    assert rules[1]._prefetched[1] == "stack: python\n"
+    ini_file.unlink()
+    yaml_file.unlink()